@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration
+Used by startup.sh and the Procfile: gunicorn new_backend:app -c gunicorn.conf.py
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+
+# gevent workers keep serving other requests while one waits on PostgreSQL or
+# SMTP; set GUNICORN_WORKER_CLASS=gthread to fall back to plain threads
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+# worker_connections caps concurrent greenlets per gevent worker; threads only
+# means anything to the gthread fallback, so it is left unset otherwise
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+if worker_class == 'gthread':
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = 120
+loglevel = 'info'
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative so a query yields to other greenlets"""
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def post_worker_init(worker):
+    """Refuse to serve until init_db.py has built the indexes the upserts need"""
+    from new_backend import check_unique_indexes
+    check_unique_indexes()
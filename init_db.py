@@ -3,91 +3,155 @@ Initialize Database Script
 Run this to set up the database with initial data
 """
 
-from new_backend import app, db, User, Therapist, Client, TrackingCategory, bcrypt
+from new_backend import app, db, User, Therapist, Client, TrackingCategory, CategoryResponse, bcrypt
 from datetime import datetime
+from sqlalchemy import delete, exists, func, insert, inspect, select
+from urllib.parse import urlsplit, urlunsplit
 import os
 
+def remove_duplicate_category_responses():
+    """Keep only the newest category response per client, category and day
+
+    Only runs while the unique index is missing; once it exists there can
+    be no duplicates.
+    """
+    existing = {index['name'] for index in inspect(db.engine).get_indexes(CategoryResponse.__tablename__)}
+    if 'uq_category_responses_client_category_date' in existing:
+        return
+
+    ranked = select(
+        CategoryResponse.id,
+        func.row_number().over(
+            partition_by=(CategoryResponse.client_id, CategoryResponse.category_id,
+                          CategoryResponse.response_date),
+            order_by=(CategoryResponse.created_at.desc().nulls_last(), CategoryResponse.id.desc())
+        ).label('rank')
+    ).where(
+        CategoryResponse.client_id.is_not(None),
+        CategoryResponse.category_id.is_not(None)
+    ).subquery()
+
+    with db.engine.begin() as conn:
+        removed = conn.execute(
+            delete(CategoryResponse).where(
+                CategoryResponse.id.in_(select(ranked.c.id).where(ranked.c.rank > 1))
+            )
+        ).rowcount
+    if removed:
+        print(f"Removed {removed} duplicate category responses")
+
+
 def init_database():
     """Initialize the database with tables and default data"""
     with app.app_context():
         # Create all tables
         print("Creating database tables...")
         db.create_all()
+
+        # The check-in upsert needs its unique index; clear out duplicates the
+        # old check-then-insert race may have left before building it
+        remove_duplicate_category_responses()
+
+        # create_all() leaves existing tables alone, so add any model index
+        # that an older deployment's tables are still missing
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.unique:
+                    # Upserts depend on these, so a failure here fails the deploy
+                    index.create(db.engine, checkfirst=True)
+                    continue
+                try:
+                    index.create(db.engine, checkfirst=True)
+                except Exception as e:
+                    # A missing lookup index only costs speed; report it and keep deploying
+                    print(f"WARNING: could not create index {index.name}: {e}")
         
-        # Check if already initialized
-        if TrackingCategory.query.count() > 0:
-            print("Database already initialized!")
-            return
-        
-        # Add default tracking categories
-        print("Adding default tracking categories...")
-        default_categories = [
-            TrackingCategory(
-                name='Emotion Level',
-                description='Overall emotional state',
-                is_default=True
-            ),
-            TrackingCategory(
-                name='Energy',
-                description='Physical and mental energy levels',
-                is_default=True
-            ),
-            TrackingCategory(
-                name='Social Activity',
-                description='Engagement in social interactions',
-                is_default=True
-            ),
-            TrackingCategory(
-                name='Sleep Quality',
-                description='Quality of sleep',
-                is_default=False
-            ),
-            TrackingCategory(
-                name='Anxiety Level',
-                description='Level of anxiety experienced',
-                is_default=False
-            ),
-            TrackingCategory(
-                name='Motivation',
-                description='Level of motivation and drive',
-                is_default=False
-            )
-        ]
-        
-        for category in default_categories:
-            db.session.add(category)
+        # Seed everything in one explicit transaction: a single COMMIT at the end
+        # of the block, rolled back as a whole if any insert fails
+        with db.session.begin():
+            # Check if already initialized
+            if db.session.scalar(select(exists().where(TrackingCategory.id.is_not(None)))):
+                print("Database already initialized!")
+                return
         
-        # Create demo therapist account (optional)
-        if os.environ.get('CREATE_DEMO_ACCOUNTS', 'false').lower() == 'true':
-            print("Creating demo therapist account...")
+            # Add default tracking categories (single multi-row INSERT)
+            print("Adding default tracking categories...")
+            default_categories = [
+                {
+                    'name': 'Emotion Level',
+                    'description': 'Overall emotional state',
+                    'is_default': True
+                },
+                {
+                    'name': 'Energy',
+                    'description': 'Physical and mental energy levels',
+                    'is_default': True
+                },
+                {
+                    'name': 'Social Activity',
+                    'description': 'Engagement in social interactions',
+                    'is_default': True
+                },
+                {
+                    'name': 'Sleep Quality',
+                    'description': 'Quality of sleep',
+                    'is_default': False
+                },
+                {
+                    'name': 'Anxiety Level',
+                    'description': 'Level of anxiety experienced',
+                    'is_default': False
+                },
+                {
+                    'name': 'Motivation',
+                    'description': 'Level of motivation and drive',
+                    'is_default': False
+                }
+            ]
+
+            db.session.execute(insert(TrackingCategory), default_categories)
+
+            # Create demo therapist account (optional)
+            if os.environ.get('CREATE_DEMO_ACCOUNTS', 'false').lower() == 'true':
+                print("Creating demo therapist account...")
             
-            # Check if demo account already exists
-            if not User.query.filter_by(email='demo.therapist@example.com').first():
-                demo_therapist_user = User(
-                    email='demo.therapist@example.com',
-                    password_hash=bcrypt.generate_password_hash('demo123').decode('utf-8'),
-                    role='therapist',
-                    is_active=True
+                # Check if demo account already exists
+                demo_user_id = db.session.scalar(
+                    select(User.id).filter_by(email='demo.therapist@example.com').limit(1)
                 )
-                db.session.add(demo_therapist_user)
-                db.session.flush()
-                
-                demo_therapist = Therapist(
-                    user_id=demo_therapist_user.id,
-                    license_number='DEMO-12345',
-                    name='Dr. Demo Therapist',
-                    organization='Demo Mental Health Clinic',
-                    specializations=['Anxiety', 'Depression', 'Stress Management']
-                )
-                db.session.add(demo_therapist)
+                if demo_user_id is None:
+                    # Only pay for the bcrypt KDF when the account is actually created;
+                    # operators can pre-bake the hash via DEMO_PASSWORD_HASH
+                    demo_password_hash = (os.environ.get('DEMO_PASSWORD_HASH') or
+                                          bcrypt.generate_password_hash('demo123').decode('utf-8'))
+                    # INSERT ... RETURNING hands back the user id without a separate flush
+                    demo_user_id = db.session.scalar(
+                        insert(User).values(
+                            email='demo.therapist@example.com',
+                            password_hash=demo_password_hash,
+                            role='therapist',
+                            is_active=True
+                        ).returning(User.id)
+                    )
+
+                    db.session.execute(
+                        insert(Therapist).values(
+                            user_id=demo_user_id,
+                            license_number='DEMO-12345',
+                            name='Dr. Demo Therapist',
+                            organization='Demo Mental Health Clinic',
+                            specializations=['Anxiety', 'Depression', 'Stress Management']
+                        )
+                    )
                 
-                print("Demo therapist created:")
-                print("  Email: demo.therapist@example.com")
-                print("  Password: demo123")
-                print("  License: DEMO-12345")
-        
-        # Commit all changes
-        db.session.commit()
+                    print("Demo therapist created:")
+                    print("  Email: demo.therapist@example.com")
+                    if os.environ.get('DEMO_PASSWORD_HASH'):
+                        print("  Password: (pre-hashed via DEMO_PASSWORD_HASH)")
+                    else:
+                        print("  Password: demo123")
+                    print("  License: DEMO-12345")
+
         print("Database initialization complete!")
 
 if __name__ == '__main__':
@@ -104,10 +168,11 @@ if __name__ == '__main__':
     # Check database URL
     db_url = os.environ.get('DATABASE_URL', 'Not set')
     if db_url != 'Not set':
-        # Hide password in output
-        if '@' in db_url:
-            parts = db_url.split('@')
-            safe_url = parts[0].split('//')[0] + '//***:***@' + parts[1]
+        # Hide credentials in output
+        parts = urlsplit(db_url)
+        if '@' in parts.netloc:
+            netloc = '***:***@' + parts.netloc.rpartition('@')[2]
+            safe_url = urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
             print(f"Database URL: {safe_url}")
         else:
             print(f"Database URL: {db_url}")
@@ -1,21 +1,92 @@
 import re
+import string
 import datetime
+import functools
 import json
+from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Sequence, Tuple, Optional, Union
 
+_MAJOR_CITIES_PATH = Path(__file__).resolve().parent / 'major_cities.json'
 
-@dataclass
+# Character sets for name/city checks. Membership tests and str.translate run in a
+# single C-level pass, so the validators never enter the regex engine.
+_NAME_INVALID_CHARS = frozenset('<>{}[]\\|`~!@#$%^&*()+=')
+_NAME_ALLOWED_DELETE = str.maketrans('', '', string.ascii_letters + ".-'")
+_CITY_ALLOWED_DELETE = str.maketrans('', '', string.ascii_letters + ".-'àáâãäåæçèéêëìíîïñòóôõöøùúûüýÿ")
+
+
+def _only_allowed_chars(text: str, allowed_delete: Dict[int, None]) -> bool:
+    """True if every character is whitespace or removed by the translate table"""
+    leftover = text.translate(allowed_delete)
+    return not leftover or leftover.isspace()
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile keywords into one alternation that reports every occurrence.
+
+    The zero-width lookahead lets overlapping keywords (e.g. "active" inside
+    "inactive") all be found in a single scan of the input.
+    """
+    return re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))')
+
+
+# Shared by every result built without suggestions; a tuple so it cannot be
+# mutated through one result and leak into the next
+_EMPTY_SUGGESTIONS = ()
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of input validation"""
     is_valid: bool
     value: Optional[Union[str, int]]
     error_message: str = ""
-    suggestions: List[str] = None
+    suggestions: Sequence[str] = None
 
     def __post_init__(self):
         if self.suggestions is None:
-            self.suggestions = []
+            self.suggestions = _EMPTY_SUGGESTIONS
+
+
+# Shared results for empty input, returned by reference on every empty call;
+# their suggestions are tuples so no caller can change them for the next one.
+_EMPTY_NAME = ValidationResult(False, None, "Name cannot be empty",
+                               ("Enter patient's full name or initials for privacy (e.g., 'J.D.' or 'John Doe')",))
+_EMPTY_AGE = ValidationResult(False, None, "Age cannot be empty",
+                              ("Enter a number between 0 and 120",))
+_INVALID_AGE = ValidationResult(False, None, "Age must be a valid number",
+                                ("Enter a whole number (e.g., 25, 45, 67)",))
+_EMPTY_CITY = ValidationResult(False, None, "City cannot be empty",
+                               ("Enter the city or location name",))
+_EMPTY_GENDER = ValidationResult(False, None, "Gender selection cannot be empty",
+                                 ("Enter 1 for Male, 2 for Female, 3 for Non-binary, 4 for Prefer not to say",))
+_EMPTY_EMPLOYMENT = ValidationResult(False, None, "Employment status cannot be empty",
+                                     ("Enter a number from 1-7 for employment status",))
+_EMPTY_FINANCIAL = ValidationResult(False, None, "Financial status cannot be empty",
+                                    ("Enter 1 for Low income, 2 for Moderate income, 3 for Stable income",))
+_EMPTY_EXERCISE = ValidationResult(False, None, "Exercise level cannot be empty",
+                                   ("Enter 1-4 for exercise level",))
+
+# Help text for the numbered-choice validators, shared by every invalid result,
+# so tuples rather than lists
+_GENDER_HELP = ("Valid options: 1=Male, 2=Female, 3=Non-binary, 4=Prefer not to say",)
+_EMPLOYMENT_HELP = (
+    "Valid options:",
+    "1=Full-time employed, 2=Part-time employed, 3=Unemployed (seeking)",
+    "4=Unemployed (not seeking), 5=Student, 6=Retired, 7=Unable to work"
+)
+_FINANCIAL_HELP = (
+    "Valid options:",
+    "1=Low income (difficulty meeting basic needs)",
+    "2=Moderate income (meets basic needs with constraints)",
+    "3=Stable income (comfortable with discretionary spending)"
+)
+_EXERCISE_HELP = (
+    "Valid options:",
+    "1=Very active (5+ times/week), 2=Moderately active (3-4 times/week)",
+    "3=Lightly active (1-2 times/week), 4=Sedentary (little/no exercise)"
+)
 
 
 class GlobalInputValidator:
@@ -36,35 +107,121 @@ class GlobalInputValidator:
             "11": ("israel", "Israel"),
             "12": ("france", "France")
         }
+        self._country_option_count = len(self.country_options)
+        self._country_range_hint = f"Enter a number from 1-{self._country_option_count}"
+        self._country_options_help = "Available options: " + ", ".join(
+            f"{k}={v[1]}" for k, v in self.country_options.items())
+        self._empty_country = ValidationResult(False, None, "Country selection cannot be empty",
+                                               (self._country_range_hint,))
+
+        # Lower-cased names/codes for text matching, plus an exact-name index that
+        # resolves to the same key the substring scan would pick first
+        self._country_search = tuple(
+            (key, display_name.lower(), code.lower(), display_name)
+            for key, (code, display_name) in self.country_options.items()
+        )
+        self._country_by_name = {}
+        for _, display_lower, code_lower, _ in self._country_search:
+            for token in (display_lower, code_lower):
+                if token not in self._country_by_name:
+                    self._country_by_name[token] = self._match_country_text(token)
+
+        # Selection maps for the numbered-choice validators
+        self.gender_map = {
+            "1": "Male",
+            "2": "Female",
+            "3": "Non-binary",
+            "4": "Prefer not to say"
+        }
+
+        self.employment_map = {
+            "1": "Full-time employed",
+            "2": "Part-time employed",
+            "3": "Unemployed - actively seeking",
+            "4": "Unemployed - not seeking",
+            "5": "Student",
+            "6": "Retired",
+            "7": "Unable to work"
+        }
+
+        self.financial_map = {
+            "1": "low_income",
+            "2": "moderate_income",
+            "3": "stable_income"
+        }
 
-        # Common city names by country for validation assistance
-        self.major_cities_by_country = {
-            "united_states": ["new york", "los angeles", "chicago", "houston", "phoenix", "philadelphia",
-                              "san antonio", "san diego", "dallas", "san jose", "austin", "jacksonville"],
-            "canada": ["toronto", "montreal", "vancouver", "calgary", "edmonton", "ottawa", "winnipeg"],
-            "united_kingdom": ["london", "birmingham", "manchester", "glasgow", "liverpool", "leeds", "sheffield"],
-            "australia": ["sydney", "melbourne", "brisbane", "perth", "adelaide", "gold coast", "canberra"],
-            "germany": ["berlin", "hamburg", "munich", "cologne", "frankfurt", "stuttgart", "düsseldorf"],
-            "japan": ["tokyo", "osaka", "yokohama", "nagoya", "sapporo", "fukuoka", "kyoto"],
-            "india": ["mumbai", "delhi", "bangalore", "kolkata", "chennai", "hyderabad", "pune"],
-            "brazil": ["são paulo", "rio de janeiro", "brasília", "salvador", "fortaleza", "belo horizonte"],
-            "south_africa": ["johannesburg", "cape town", "durban", "pretoria", "port elizabeth"],
-            "sweden": ["stockholm", "göteborg", "malmö", "uppsala", "västerås", "örebro"],
-            "israel": ["tel aviv", "jerusalem", "haifa", "rishon lezion", "petah tikva", "ashdod", "netanya"],
-            "france": ["paris", "marseille", "lyon", "toulouse", "nice", "nantes", "strasbourg", "montpellier"]
+        self.exercise_map = {
+            "1": "Very active",
+            "2": "Moderately active",
+            "3": "Lightly active",
+            "4": "Sedentary"
         }
 
+        # Keyword fallbacks for free-text financial/exercise answers
+        self.financial_text_matches = {
+            "low": "1",
+            "poor": "1",
+            "limited": "1",
+            "moderate": "2",
+            "middle": "2",
+            "average": "2",
+            "stable": "3",
+            "good": "3",
+            "comfortable": "3",
+            "high": "3"
+        }
+        self.exercise_text_matches = {
+            "very": "1",
+            "high": "1",
+            "active": "1",
+            "moderate": "2",
+            "medium": "2",
+            "light": "3",
+            "little": "3",
+            "sedentary": "4",
+            "none": "4",
+            "inactive": "4"
+        }
+
+        # (label_lower, key) tables for _match_text, built once so only the user
+        # input is lower-cased per call
+        self._gender_lower = tuple((value.lower(), key) for key, value in self.gender_map.items())
+        self._employment_lower = tuple((value.lower(), key) for key, value in self.employment_map.items())
+
+        # Keyword tables compiled into single-pass patterns; the rank keeps the
+        # table's order as the tie-breaker when several keywords appear
+        self._financial_pattern = _keyword_pattern(self.financial_text_matches)
+        self._financial_rank = {text: rank for rank, text in enumerate(self.financial_text_matches)}
+        self._exercise_pattern = _keyword_pattern(self.exercise_text_matches)
+        self._exercise_rank = {text: rank for rank, text in enumerate(self.exercise_text_matches)}
+
+    @functools.cached_property
+    def major_cities_by_country(self) -> Dict[str, List[str]]:
+        """Common city names by country, loaded from major_cities.json on first city validation"""
+        with open(_MAJOR_CITIES_PATH, encoding='utf-8') as f:
+            return json.load(f)
+
+    @functools.cached_property
+    def _major_city_sets(self) -> Dict[str, set]:
+        """Exact-name lookup set per country"""
+        return {country: set(cities) for country, cities in self.major_cities_by_country.items()}
+
+    @functools.cached_property
+    def _cities_by_first_letter(self) -> Dict[str, Dict[str, List[str]]]:
+        """Per-country buckets of city names keyed by first letter"""
+        index = {}
+        for country, cities in self.major_cities_by_country.items():
+            buckets = index[country] = {}
+            for city in cities:
+                buckets.setdefault(city[0], []).append(city)
+        return index
+
     def validate_name(self, name: str) -> ValidationResult:
         """Validate patient name or initials"""
         name = name.strip()
 
         if not name:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Name cannot be empty",
-                suggestions=["Enter patient's full name or initials for privacy (e.g., 'J.D.' or 'John Doe')"]
-            )
+            return _EMPTY_NAME
 
         if len(name) > 100:
             return ValidationResult(
@@ -75,7 +232,7 @@ class GlobalInputValidator:
             )
 
         # Check for potentially invalid characters
-        if re.search(r'[<>{}[\]\\|`~!@#$%^&*()+=]', name):
+        if not _NAME_INVALID_CHARS.isdisjoint(name):
             return ValidationResult(
                 is_valid=False,
                 value=None,
@@ -84,7 +241,7 @@ class GlobalInputValidator:
             )
 
         # Check for reasonable name pattern
-        if re.match(r'^[A-Za-z\s\.\-\']+$', name):
+        if _only_allowed_chars(name, _NAME_ALLOWED_DELETE):
             return ValidationResult(is_valid=True, value=name)
 
         return ValidationResult(
@@ -99,22 +256,18 @@ class GlobalInputValidator:
         age_input = age_input.strip()
 
         if not age_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Age cannot be empty",
-                suggestions=["Enter a number between 0 and 120"]
-            )
+            return _EMPTY_AGE
+
+        # Reject obvious garbage without raising; int() still has the final
+        # say on anything that looks numeric (signs, underscores, Unicode digits)
+        digits = age_input[1:] if age_input[0] in '+-' else age_input
+        if not digits.replace('_', '').isdigit():
+            return _INVALID_AGE
 
         try:
             age = int(age_input)
         except ValueError:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Age must be a valid number",
-                suggestions=["Enter a whole number (e.g., 25, 45, 67)"]
-            )
+            return _INVALID_AGE
 
         if age < 0:
             return ValidationResult(
@@ -141,38 +294,46 @@ class GlobalInputValidator:
 
         return ValidationResult(is_valid=True, value=age)
 
+    def _match_country_text(self, country_input_lower: str) -> Optional[Tuple[str, str]]:
+        """Return (key, display_name) of the first country whose name or code contains the text"""
+        for key, display_lower, code_lower, display_name in self._country_search:
+            if country_input_lower in display_lower or country_input_lower in code_lower:
+                return key, display_name
+        return None
+
+    def _match_text(self, needle_lower: str, lower_table: Tuple[Tuple[str, str], ...]) -> Optional[str]:
+        """Return the key of the first option whose lower-cased label contains the text"""
+        for value_lower, key in lower_table:
+            if needle_lower in value_lower:
+                return key
+        return None
+
     def validate_country_selection(self, country_input: str) -> ValidationResult:
         """Validate country selection"""
         country_input = country_input.strip()
 
         if not country_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Country selection cannot be empty",
-                suggestions=[f"Enter a number from 1-{len(self.country_options)}"]
-            )
+            return self._empty_country
 
         if country_input not in self.country_options:
-            # Try to match by country name
+            # Try to match by country name (exact name/code first, then substring)
             country_input_lower = country_input.lower()
-            for key, (code, display_name) in self.country_options.items():
-                if (country_input_lower in display_name.lower() or
-                        country_input_lower in code.lower()):
-                    return ValidationResult(
-                        is_valid=True,
-                        value=key,
-                        suggestions=[f"Matched to: {display_name}"]
-                    )
+            match = self._country_by_name.get(country_input_lower)
+            if match is None:
+                match = self._match_country_text(country_input_lower)
+            if match is not None:
+                key, display_name = match
+                return ValidationResult(
+                    is_valid=True,
+                    value=key,
+                    suggestions=[f"Matched to: {display_name}"]
+                )
 
             return ValidationResult(
                 is_valid=False,
                 value=None,
                 error_message=f"Invalid country selection: '{country_input}'",
-                suggestions=[
-                    f"Enter a number from 1-{len(self.country_options)}",
-                    "Available options: " + ", ".join([f"{k}={v[1]}" for k, v in self.country_options.items()])
-                ]
+                suggestions=(self._country_range_hint, self._country_options_help)
             )
 
         country_code, country_name = self.country_options[country_input]
@@ -187,12 +348,7 @@ class GlobalInputValidator:
         city_input = city_input.strip()
 
         if not city_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="City cannot be empty",
-                suggestions=["Enter the city or location name"]
-            )
+            return _EMPTY_CITY
 
         if len(city_input) > 100:
             return ValidationResult(
@@ -202,7 +358,7 @@ class GlobalInputValidator:
             )
 
         # Check for valid city name characters
-        if not re.match(r'^[A-Za-z\s\.\-\'àáâãäåæçèéêëìíîïñòóôõöøùúûüýÿ]+$', city_input):
+        if not _only_allowed_chars(city_input, _CITY_ALLOWED_DELETE):
             return ValidationResult(
                 is_valid=False,
                 value=None,
@@ -217,14 +373,13 @@ class GlobalInputValidator:
             city_lower = city_input.lower()
             major_cities = self.major_cities_by_country[country_code]
 
-            # Check if it's a major city
-            for major_city in major_cities:
-                if major_city in city_lower or city_lower in major_city:
-                    suggestions.append(f"Recognized as major city in {country_code.replace('_', ' ').title()}")
-                    break
+            # Check if it's a major city (exact hit first, then substring match)
+            if city_lower in self._major_city_sets[country_code] or any(
+                    major_city in city_lower or city_lower in major_city for major_city in major_cities):
+                suggestions.append(f"Recognized as major city in {country_code.replace('_', ' ').title()}")
             else:
                 # Suggest similar cities
-                similar_cities = [city for city in major_cities if city[0].lower() == city_lower[0].lower()]
+                similar_cities = self._cities_by_first_letter[country_code].get(city_lower[0], [])
                 if similar_cities:
                     suggestions.append(
                         f"Similar cities in {country_code.replace('_', ' ').title()}: {', '.join(similar_cities[:3])}")
@@ -235,150 +390,89 @@ class GlobalInputValidator:
         """Validate gender selection"""
         gender_input = gender_input.strip()
 
-        gender_map = {
-            "1": "Male",
-            "2": "Female",
-            "3": "Non-binary",
-            "4": "Prefer not to say"
-        }
-
         if not gender_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Gender selection cannot be empty",
-                suggestions=["Enter 1 for Male, 2 for Female, 3 for Non-binary, 4 for Prefer not to say"]
-            )
+            return _EMPTY_GENDER
 
-        if gender_input not in gender_map:
+        if gender_input not in self.gender_map:
             # Try to match by text
-            gender_lower = gender_input.lower()
-            for key, value in gender_map.items():
-                if gender_lower in value.lower() or value.lower().startswith(gender_lower):
-                    return ValidationResult(
-                        is_valid=True,
-                        value=key,
-                        suggestions=[f"Matched to: {value}"]
-                    )
+            key = self._match_text(gender_input.lower(), self._gender_lower)
+            if key is not None:
+                return ValidationResult(
+                    is_valid=True,
+                    value=key,
+                    suggestions=[f"Matched to: {self.gender_map[key]}"]
+                )
 
             return ValidationResult(
                 is_valid=False,
                 value=None,
                 error_message=f"Invalid gender selection: '{gender_input}'",
-                suggestions=["Valid options: 1=Male, 2=Female, 3=Non-binary, 4=Prefer not to say"]
+                suggestions=_GENDER_HELP
             )
 
         return ValidationResult(
             is_valid=True,
             value=gender_input,
-            suggestions=[f"Selected: {gender_map[gender_input]}"]
+            suggestions=[f"Selected: {self.gender_map[gender_input]}"]
         )
 
     def validate_employment_status(self, employment_input: str) -> ValidationResult:
         """Validate employment status selection"""
         employment_input = employment_input.strip()
 
-        employment_map = {
-            "1": "Full-time employed",
-            "2": "Part-time employed",
-            "3": "Unemployed - actively seeking",
-            "4": "Unemployed - not seeking",
-            "5": "Student",
-            "6": "Retired",
-            "7": "Unable to work"
-        }
-
         if not employment_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Employment status cannot be empty",
-                suggestions=["Enter a number from 1-7 for employment status"]
-            )
+            return _EMPTY_EMPLOYMENT
 
-        if employment_input not in employment_map:
+        if employment_input not in self.employment_map:
             # Try to match by text
-            employment_lower = employment_input.lower()
-            for key, value in employment_map.items():
-                if employment_lower in value.lower():
-                    return ValidationResult(
-                        is_valid=True,
-                        value=key,
-                        suggestions=[f"Matched to: {value}"]
-                    )
+            key = self._match_text(employment_input.lower(), self._employment_lower)
+            if key is not None:
+                return ValidationResult(
+                    is_valid=True,
+                    value=key,
+                    suggestions=[f"Matched to: {self.employment_map[key]}"]
+                )
 
             return ValidationResult(
                 is_valid=False,
                 value=None,
                 error_message=f"Invalid employment status: '{employment_input}'",
-                suggestions=[
-                    "Valid options:",
-                    "1=Full-time employed, 2=Part-time employed, 3=Unemployed (seeking)",
-                    "4=Unemployed (not seeking), 5=Student, 6=Retired, 7=Unable to work"
-                ]
+                suggestions=_EMPLOYMENT_HELP
             )
 
         return ValidationResult(
             is_valid=True,
             value=employment_input,
-            suggestions=[f"Selected: {employment_map[employment_input]}"]
+            suggestions=[f"Selected: {self.employment_map[employment_input]}"]
         )
 
     def validate_financial_status(self, financial_input: str, country_code: str = None) -> ValidationResult:
         """Validate financial status selection with country context"""
         financial_input = financial_input.strip()
 
-        financial_map = {
-            "1": "low_income",
-            "2": "moderate_income",
-            "3": "stable_income"
-        }
-
         if not financial_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Financial status cannot be empty",
-                suggestions=["Enter 1 for Low income, 2 for Moderate income, 3 for Stable income"]
-            )
+            return _EMPTY_FINANCIAL
 
-        if financial_input not in financial_map:
+        if financial_input not in self.financial_map:
             # Try to match by text
             financial_lower = financial_input.lower()
-            text_matches = {
-                "low": "1",
-                "poor": "1",
-                "limited": "1",
-                "moderate": "2",
-                "middle": "2",
-                "average": "2",
-                "stable": "3",
-                "good": "3",
-                "comfortable": "3",
-                "high": "3"
-            }
-
-            for text, key in text_matches.items():
-                if text in financial_lower:
-                    return ValidationResult(
-                        is_valid=True,
-                        value=key,
-                        suggestions=[f"Matched to: {financial_map[key].replace('_', ' ').title()}"]
-                    )
+            found = self._financial_pattern.findall(financial_lower)
+            if found:
+                key = self.financial_text_matches[min(found, key=self._financial_rank.__getitem__)]
+                return ValidationResult(
+                    is_valid=True,
+                    value=key,
+                    suggestions=[f"Matched to: {self.financial_map[key].replace('_', ' ').title()}"]
+                )
 
             return ValidationResult(
                 is_valid=False,
                 value=None,
                 error_message=f"Invalid financial status: '{financial_input}'",
-                suggestions=[
-                    "Valid options:",
-                    "1=Low income (difficulty meeting basic needs)",
-                    "2=Moderate income (meets basic needs with constraints)",
-                    "3=Stable income (comfortable with discretionary spending)"
-                ]
+                suggestions=_FINANCIAL_HELP
             )
 
-        suggestions = [f"Selected: {financial_map[financial_input].replace('_', ' ').title()}"]
+        suggestions = [f"Selected: {self.financial_map[financial_input].replace('_', ' ').title()}"]
 
         # Add country-specific context
         if country_code:
@@ -391,57 +485,27 @@ class GlobalInputValidator:
         """Validate exercise level selection"""
         exercise_input = exercise_input.strip()
 
-        exercise_map = {
-            "1": "Very active",
-            "2": "Moderately active",
-            "3": "Lightly active",
-            "4": "Sedentary"
-        }
-
         if not exercise_input:
-            return ValidationResult(
-                is_valid=False,
-                value=None,
-                error_message="Exercise level cannot be empty",
-                suggestions=["Enter 1-4 for exercise level"]
-            )
+            return _EMPTY_EXERCISE
 
-        if exercise_input not in exercise_map:
+        if exercise_input not in self.exercise_map:
             # Try to match by text
             exercise_lower = exercise_input.lower()
-            text_matches = {
-                "very": "1",
-                "high": "1",
-                "active": "1",
-                "moderate": "2",
-                "medium": "2",
-                "light": "3",
-                "little": "3",
-                "sedentary": "4",
-                "none": "4",
-                "inactive": "4"
-            }
-
-            for text, key in text_matches.items():
-                if text in exercise_lower:
-                    return ValidationResult(
-                        is_valid=True,
-                        value=key,
-                        suggestions=[f"Matched to: {exercise_map[key]}"]
-                    )
+            found = self._exercise_pattern.findall(exercise_lower)
+            if found:
+                key = self.exercise_text_matches[min(found, key=self._exercise_rank.__getitem__)]
+                return ValidationResult(
+                    is_valid=True,
+                    value=key,
+                    suggestions=[f"Matched to: {self.exercise_map[key]}"]
+                )
 
             return ValidationResult(
                 is_valid=False,
                 value=None,
                 error_message=f"Invalid exercise level: '{exercise_input}'",
-                suggestions=[
-                    "Valid options:",
-                    "1=Very active (5+ times/week), 2=Moderately active (3-4 times/week)",
-                    "3=Lightly active (1-2 times/week), 4=Sedentary (little/no exercise)"
-                ]
+                suggestions=_EXERCISE_HELP
             )
 
         return ValidationResult(is_valid=True, value=exercise_input,
-                                suggestions=[f"Selected: {exercise_map[exercise_input]}"])
-
-    def
\ No newline at end of file
+                                suggestions=[f"Selected: {self.exercise_map[exercise_input]}"])
@@ -3,36 +3,83 @@ Migration Script: JSON to PostgreSQL
 Transfers existing data from JSON files to the new database
 """
 
+import gc
+import io
 import os
-import json
-from datetime import datetime, date
+import sys
+import ijson
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, time
+from functools import partial
 from pathlib import Path
+from sqlalchemy import func, insert, select, text, true
+from sqlalchemy.orm import Session
 from new_backend import app, db, User, Therapist, Client, DailyCheckin, WeeklyGoal, TherapistNote, TrackingCategory, ClientTrackingPlan, bcrypt
 
+# daily_checkins columns written by COPY, in stream order
+CHECKIN_COPY_COLUMNS = (
+    'client_id', 'checkin_date', 'checkin_time',
+    'emotional_value', 'emotional_notes',
+    'medication_value', 'medication_notes',
+    'activity_value', 'activity_notes',
+    'created_at'
+)
+
+# Files larger than this are streamed with ijson and trimmed to the keys a
+# parser reads, instead of materializing e.g. a long embedded history
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+
+THERAPIST_FIELDS = frozenset({
+    'email', 'password_hash', 'active', 'created_at',
+    'license_number', 'name', 'organization', 'specializations'
+})
+PATIENT_FIELDS = frozenset({
+    'status', 'enrolledBy', 'therapistEmail', 'enrollmentDate', 'notes', 'additional_notes'
+})
+CHECKIN_FIELDS = frozenset({'date', 'time', 'emotional', 'medication', 'activity'})
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
 def migrate_data():
     """Migrate all JSON data to PostgreSQL"""
     with app.app_context():
         print("Starting migration from JSON to PostgreSQL...")
+        print(f"Executemany mode: {db.engine.dialect.executemany_mode.name}")
         
         # Ensure database is initialized
         db.create_all()
         
-        # Check if categories exist
-        if TrackingCategory.query.count() == 0:
-            print("Initializing tracking categories...")
-            init_tracking_categories()
-        
-        # Migrate therapists
-        therapists_migrated = migrate_therapists()
-        print(f"Migrated {therapists_migrated} therapists")
-        
-        # Migrate patients/clients
-        clients_migrated = migrate_clients()
-        print(f"Migrated {clients_migrated} clients")
-        
-        # Migrate check-ins
-        checkins_migrated = migrate_checkins()
-        print(f"Migrated {checkins_migrated} check-ins")
+        # Pin one connection for every phase: the session is bound straight to it,
+        # so the commits between phases don't hand it back to the pool (and
+        # pre-ping it again on the next checkout); COPY runs on it as well
+        with db.engine.connect() as connection:
+            db.session.registry.set(Session(bind=connection))
+            # The run allocates many short-lived, acyclic row dicts; pause the
+            # cyclic collector so it doesn't keep rescanning them mid-load
+            gc.disable()
+            try:
+                # Check if categories exist
+                with db.session.begin():
+                    if TrackingCategory.query.count() == 0:
+                        print("Initializing tracking categories...")
+                        init_tracking_categories()
+                
+                # Migrate therapists
+                therapists_migrated, therapist_map = migrate_therapists()
+                print(f"Migrated {therapists_migrated} therapists")
+                
+                # Migrate patients/clients
+                clients_migrated, client_map = migrate_clients(therapist_map)
+                print(f"Migrated {clients_migrated} clients")
+                
+                # Migrate check-ins
+                checkins_migrated = migrate_checkins(client_map)
+                print(f"Migrated {checkins_migrated} check-ins")
+            finally:
+                db.session.remove()
+                gc.enable()
+                gc.collect()
         
         print("\nMigration complete!")
         print("\nSummary:")
@@ -40,6 +87,125 @@ def migrate_data():
         print(f"- Clients: {clients_migrated}")
         print(f"- Check-ins: {checkins_migrated}")
 
+def _load_json(file_path, fields):
+    """Load a top-level JSON object; large files keep only the given keys"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > STREAM_THRESHOLD_BYTES:
+            return {key: value for key, value in ijson.kvitems(f, '', use_float=True) if key in fields}
+        return orjson.loads(f.read())
+
+def _intern_text(value):
+    """Intern short free-text values so repeated notes ('', 'ok', ...) share one object.
+    
+    Pickle memoizes by identity, so interned duplicates also cross back from the
+    worker processes once per result chunk rather than once per row.
+    """
+    if type(value) is str and len(value) <= 64:
+        return sys.intern(value)
+    return value
+
+def _parse_date(text):
+    """Parse 'YYYY-MM-DD' via the C fromisoformat fast path, strptime for looser forms"""
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, '%Y-%m-%d').date()
+
+def _parse_time(text):
+    """Parse 'HH:MM' via the C fromisoformat fast path, strptime for looser forms"""
+    try:
+        return time.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, '%H:%M').time()
+
+def parse_therapist_file(file_path):
+    """Read a therapist JSON file into user/therapist column values (no ORM access)"""
+    data = _load_json(file_path, THERAPIST_FIELDS)
+    
+    return {
+        'email': data['email'],
+        'password_hash': data.get('password_hash'),  # None -> fallback hash
+        'is_active': data.get('active', True),
+        'created_at': datetime.fromisoformat(data.get('created_at', datetime.now().isoformat())),
+        'license_number': data.get('license_number'),  # None -> LEGACY-<n>
+        'name': data['name'],
+        'organization': data.get('organization', ''),
+        'specializations': data.get('specializations', [])
+    }
+
+def parse_patient_file(file_path):
+    """Read a patient JSON file into client column values (no ORM access)"""
+    data = _load_json(file_path, PATIENT_FIELDS)
+    
+    return {
+        # Extract patient ID from filename
+        'patient_id': os.path.basename(file_path)[:-5].replace('patient_', ''),
+        'is_active': data.get('status', 'active') == 'active',
+        'enrolled_by': data.get('enrolledBy'),
+        'therapist_email': data.get('therapistEmail'),
+        'start_date': _parse_date(data.get('enrollmentDate', str(date.today()))),
+        'note_content': data.get('notes', data.get('additional_notes', ''))
+    }
+
+def _int_value(value):
+    """Check-in score as an int; legacy files may store it as a JSON float (3.0)"""
+    return None if value is None else int(value)
+
+def parse_checkin_file(file_path):
+    """Read a check-in JSON file into daily_checkins column values (no ORM access)"""
+    data = _load_json(file_path, CHECKIN_FIELDS)
+    
+    # Extract date from filename or data
+    checkin_date = data.get('date')
+    if not checkin_date:
+        # Try to extract from filename
+        checkin_date = os.path.basename(file_path)[:-5].replace('checkin_', '')
+    
+    return {
+        'checkin_date': _parse_date(checkin_date),
+        'checkin_time': _parse_time(data.get('time', '12:00')),
+        'emotional_value': _int_value(data.get('emotional', {}).get('value')),
+        'emotional_notes': _intern_text(data.get('emotional', {}).get('notes', '')),
+        'medication_value': _int_value(data.get('medication', {}).get('value')),
+        'medication_notes': _intern_text(data.get('medication', {}).get('notes', '')),
+        'activity_value': _int_value(data.get('activity', {}).get('value')),
+        'activity_notes': _intern_text(data.get('activity', {}).get('notes', ''))
+    }
+
+def _copy_field(value):
+    """Render one value in COPY text format (None -> \\N, specials escaped)"""
+    if value is None:
+        return '\\N'
+    return str(value).translate(_COPY_ESCAPES)
+
+def _scan_json_files(directory, prefix=''):
+    """List '<prefix>*.json' paths in one os.scandir pass, without Path objects"""
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith('.json')
+                and not entry.name.startswith('.')]
+
+def _try_parse(parser, file_path):
+    """Run a parser in a worker process, returning (row, None) or (None, error)"""
+    try:
+        return parser(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def _parse_files(executor, parser, paths):
+    """Validation pass: parse files across CPU cores before anything is inserted.
+    
+    Returns ([(path, row), ...], [(path, error), ...]), both in input order.
+    """
+    parsed = []
+    errors = []
+    for path, (row, error) in zip(paths, executor.map(partial(_try_parse, parser), paths, chunksize=64)):
+        if error is None:
+            parsed.append((path, row))
+        else:
+            errors.append((path, error))
+    return parsed, errors
+
 def init_tracking_categories():
     """Initialize default tracking categories"""
     categories = [
@@ -51,189 +217,227 @@ def init_tracking_categories():
         ('Motivation', 'Level of motivation and drive', False)
     ]
     
-    for name, desc, is_default in categories:
-        cat = TrackingCategory(name=name, description=desc, is_default=is_default)
-        db.session.add(cat)
-    
-    db.session.commit()
+    # Single multi-row INSERT; committed by the caller's transaction
+    db.session.execute(
+        insert(TrackingCategory),
+        [{'name': name, 'description': desc, 'is_default': is_default} for name, desc, is_default in categories]
+    )
 
 def migrate_therapists():
-    """Migrate therapist data from JSON files"""
+    """Migrate therapist data from JSON files; returns (count, old email -> therapist id)"""
     count = 0
     therapists_dir = Path('therapy_data/therapists')
     
     if not therapists_dir.exists():
         print("No therapists directory found")
-        return 0
+        return 0, {}
     
-    # Create a default therapist for orphaned clients
-    default_user = User(
-        email='default.therapist@system.local',
-        password_hash=bcrypt.generate_password_hash('system_generated_' + os.urandom(16).hex()).decode('utf-8'),
-        role='therapist',
-        is_active=True
-    )
-    db.session.add(default_user)
-    db.session.flush()
+    therapist_map = {}  # Map old email to new therapist ID
     
-    default_therapist = Therapist(
-        user_id=default_user.id,
-        license_number='SYSTEM-DEFAULT',
-        name='System Default Therapist',
-        organization='Legacy Data Migration'
-    )
-    db.session.add(default_therapist)
-    db.session.flush()
+    # Hash the fallback password once rather than for every file
+    fallback_hash = bcrypt.generate_password_hash('temp_password').decode('utf-8')
     
-    therapist_map = {}  # Map old email to new therapist ID
+    # Parse files in worker processes; database writes stay on this process
+    with ProcessPoolExecutor() as executor:
+        parsed, errors = _parse_files(executor, parse_therapist_file, _scan_json_files(therapists_dir))
     
-    for file_path in therapists_dir.glob('*.json'):
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Check if already migrated
-            if User.query.filter_by(email=data['email']).first():
-                print(f"Therapist {data['email']} already exists, skipping...")
-                continue
-            
-            # Create user account
-            user = User(
-                email=data['email'],
-                password_hash=data.get('password_hash', bcrypt.generate_password_hash('temp_password').decode('utf-8')),
-                role='therapist',
-                is_active=data.get('active', True),
-                created_at=datetime.fromisoformat(data.get('created_at', datetime.now().isoformat()))
+    # One transaction for the whole phase; ids come back from INSERT ... RETURNING
+    # instead of a flush per row
+    with db.session.begin():
+        # Create a default therapist for orphaned clients (kept if an earlier run made it)
+        if db.session.scalar(
+                select(Therapist.id).filter_by(license_number='SYSTEM-DEFAULT').limit(1)) is None:
+            default_user_id = db.session.scalar(
+                insert(User).values(
+                    email='default.therapist@system.local',
+                    password_hash=bcrypt.generate_password_hash('system_generated_' + os.urandom(16).hex()).decode('utf-8'),
+                    role='therapist',
+                    is_active=True
+                ).returning(User.id)
             )
-            db.session.add(user)
-            db.session.flush()
             
-            # Create therapist profile
-            therapist = Therapist(
-                user_id=user.id,
-                license_number=data.get('license_number', f"LEGACY-{count}"),
-                name=data['name'],
-                organization=data.get('organization', ''),
-                specializations=data.get('specializations', [])
+            db.session.execute(
+                insert(Therapist).values(
+                    user_id=default_user_id,
+                    license_number='SYSTEM-DEFAULT',
+                    name='System Default Therapist',
+                    organization='Legacy Data Migration'
+                )
             )
-            db.session.add(therapist)
-            db.session.flush()
+        
+        # Load existing emails once instead of a SELECT per file; therapists keep
+        # their id so clients of an already-migrated therapist still link to it
+        existing_emails = dict(db.session.execute(
+            select(User.email, Therapist.id).outerjoin(Therapist, Therapist.user_id == User.id)
+        ).all())
+        
+        user_rows = []
+        therapist_rows = []
+        
+        for file_path, row in parsed:
+            # Check if already migrated
+            if row['email'] in existing_emails:
+                print(f"Therapist {row['email']} already exists, skipping...")
+                if existing_emails[row['email']] is not None:
+                    therapist_map.setdefault(row['email'], existing_emails[row['email']])
+                continue
             
-            therapist_map[data['email']] = therapist.id
+            # Queue user account and therapist profile
+            user_rows.append({
+                'email': row['email'],
+                'password_hash': row['password_hash'] or fallback_hash,
+                'role': 'therapist',
+                'is_active': row['is_active'],
+                'created_at': row['created_at']
+            })
+            therapist_rows.append({
+                'license_number': row['license_number'] or f"LEGACY-{count}",
+                'name': row['name'],
+                'organization': row['organization'],
+                'specializations': row['specializations']
+            })
+            existing_emails[row['email']] = None
             count += 1
+        
+        if user_rows:
+            user_ids = db.session.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True), user_rows
+            ).all()
+            for therapist_row, user_id in zip(therapist_rows, user_ids):
+                therapist_row['user_id'] = user_id
             
-        except Exception as e:
-            print(f"Error migrating therapist {file_path}: {e}")
-    
-    db.session.commit()
+            therapist_ids = db.session.scalars(
+                insert(Therapist).returning(Therapist.id, sort_by_parameter_order=True), therapist_rows
+            ).all()
+            therapist_map.update(zip([user_row['email'] for user_row in user_rows], therapist_ids))
     
-    # Save therapist map for client migration
-    with open('therapist_map.json', 'w') as f:
-        json.dump(therapist_map, f)
+    for file_path, error in errors:
+        print(f"Error migrating therapist {file_path}: {error}")
     
-    return count
+    return count, therapist_map
 
-def migrate_clients():
-    """Migrate patient/client data from JSON files"""
+def migrate_clients(therapist_map):
+    """Migrate patient/client data from JSON files; returns (count, patient id -> client id)"""
     count = 0
     patients_dir = Path('therapy_data/patients')
     
     if not patients_dir.exists():
         print("No patients directory found")
-        return 0
+        return 0, {}
     
-    # Load therapist map
-    therapist_map = {}
-    if os.path.exists('therapist_map.json'):
-        with open('therapist_map.json', 'r') as f:
-            therapist_map = json.load(f)
+    client_map = {}  # Map old patient ID to new client ID
     
-    # Get default therapist
-    default_therapist = Therapist.query.filter_by(license_number='SYSTEM-DEFAULT').first()
+    # Legacy clients share one locked placeholder password (random, so nobody can
+    # log in with it until a real password is set); minimum bcrypt cost since it
+    # only has to be a well-formed hash
+    placeholder_hash = bcrypt.generate_password_hash(
+        'migrated_locked_' + os.urandom(16).hex(), rounds=4
+    ).decode('utf-8')
     
-    client_map = {}  # Map old patient ID to new client ID
+    # Parse files in worker processes; database writes stay on this process
+    with ProcessPoolExecutor() as executor:
+        parsed, errors = _parse_files(executor, parse_patient_file, _scan_json_files(patients_dir, 'patient_'))
     
-    for file_path in patients_dir.glob('patient_*.json'):
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Extract patient ID from filename
-            patient_id = file_path.stem.replace('patient_', '')
-            
-            # Generate email for client (since old system didn't have client emails)
-            client_email = f"patient.{patient_id}@legacy.local"
+    # One transaction for the whole phase; ids come back from INSERT ... RETURNING
+    # instead of a flush per row
+    with db.session.begin():
+        # Get default therapist id (once, not per client)
+        default_therapist_id = db.session.scalar(
+            select(Therapist.id).filter_by(license_number='SYSTEM-DEFAULT').limit(1)
+        )
+        
+        # Patient ids migrated by an earlier run, from one prefix scan over the
+        # generated 'patient.<id>@legacy.local' emails instead of a SELECT per file
+        migrated_ids = set(db.session.scalars(
+            select(func.substr(User.email, 9, func.strpos(User.email, '@') - 9))
+            .where(User.email.like('patient.%@legacy.local'))
+        ))
+        
+        patient_ids = []
+        user_rows = []
+        client_rows = []
+        note_contents = []
+        
+        for file_path, row in parsed:
+            patient_id = row['patient_id']
             
             # Check if already migrated
-            if User.query.filter_by(email=client_email).first():
+            if patient_id in migrated_ids:
                 print(f"Client {patient_id} already exists, skipping...")
                 continue
             
-            # Create user account
-            user = User(
-                email=client_email,
-                password_hash=bcrypt.generate_password_hash('temp_password_' + patient_id).decode('utf-8'),
-                role='client',
-                is_active=data.get('status', 'active') == 'active'
-            )
-            db.session.add(user)
-            db.session.flush()
+            # Generate email for client (since old system didn't have client emails)
+            client_email = f"patient.{patient_id}@legacy.local"
             
             # Find therapist
-            therapist_id = None
-            if 'enrolledBy' in data and data['enrolledBy'] in therapist_map:
-                therapist_id = therapist_map[data['enrolledBy']]
-            elif 'therapistEmail' in data and data['therapistEmail'] in therapist_map:
-                therapist_id = therapist_map[data['therapistEmail']]
+            if row['enrolled_by'] in therapist_map:
+                therapist_id = therapist_map[row['enrolled_by']]
+            elif row['therapist_email'] in therapist_map:
+                therapist_id = therapist_map[row['therapist_email']]
             else:
-                therapist_id = default_therapist.id if default_therapist else None
+                therapist_id = default_therapist_id
             
-            # Create client
-            client = Client(
-                user_id=user.id,
-                client_serial=f"C{patient_id.zfill(8)}",  # Convert old ID to serial format
-                therapist_id=therapist_id,
-                start_date=datetime.strptime(data.get('enrollmentDate', str(date.today())), '%Y-%m-%d').date()
-            )
-            db.session.add(client)
-            db.session.flush()
+            # Queue user account and client
+            patient_ids.append(patient_id)
+            user_rows.append({
+                'email': client_email,
+                'password_hash': placeholder_hash,
+                'role': 'client',
+                'is_active': row['is_active']
+            })
+            client_rows.append({
+                'client_serial': f"C{patient_id.zfill(8)}",  # Convert old ID to serial format
+                'therapist_id': therapist_id,
+                'start_date': row['start_date']
+            })
+            note_contents.append(row['note_content'])
+            migrated_ids.add(patient_id)
+            count += 1
+        
+        if user_rows:
+            user_ids = db.session.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True), user_rows
+            ).all()
+            for client_row, user_id in zip(client_rows, user_ids):
+                client_row['user_id'] = user_id
             
-            # Add tracking plans (default categories)
-            default_categories = TrackingCategory.query.filter_by(is_default=True).all()
-            for category in default_categories:
-                plan = ClientTrackingPlan(
-                    client_id=client.id,
-                    category_id=category.id
-                )
-                db.session.add(plan)
+            client_ids = db.session.scalars(
+                insert(Client).returning(Client.id, sort_by_parameter_order=True), client_rows
+            ).all()
+            client_map = dict(zip(patient_ids, client_ids))
             
-            # Add enrollment note
-            if 'notes' in data or 'additional_notes' in data:
-                note_content = data.get('notes', data.get('additional_notes', ''))
-                if note_content:
-                    note = TherapistNote(
-                        client_id=client.id,
-                        therapist_id=therapist_id,
-                        note_type='migration',
-                        content=f"Migrated from legacy system: {note_content}"
-                    )
-                    db.session.add(note)
+            # Add enrollment notes
+            note_rows = [
+                {
+                    'client_id': client_id,
+                    'therapist_id': client_row['therapist_id'],
+                    'note_type': 'migration',
+                    'content': f"Migrated from legacy system: {note_content}"
+                }
+                for client_id, client_row, note_content in zip(client_ids, client_rows, note_contents)
+                if note_content
+            ]
+            if note_rows:
+                db.session.execute(insert(TherapistNote), note_rows)
             
-            client_map[patient_id] = client.id
-            count += 1
-            
-        except Exception as e:
-            print(f"Error migrating client {file_path}: {e}")
-    
-    db.session.commit()
+            # Add tracking plans (default categories) for every new client in one
+            # INSERT ... SELECT over clients x default categories
+            db.session.execute(
+                insert(ClientTrackingPlan).from_select(
+                    ['client_id', 'category_id'],
+                    select(Client.id, TrackingCategory.id)
+                    .join(TrackingCategory, true())
+                    .where(Client.id.in_(client_ids), TrackingCategory.is_default.is_(True))
+                    .order_by(Client.id, TrackingCategory.id)
+                )
+            )
     
-    # Save client map for check-in migration
-    with open('client_map.json', 'w') as f:
-        json.dump(client_map, f)
+    for file_path, error in errors:
+        print(f"Error migrating client {file_path}: {error}")
     
-    return count
+    return count, client_map
 
-def migrate_checkins():
+def migrate_checkins(client_map):
     """Migrate check-in data from JSON files"""
     count = 0
     checkins_dir = Path('therapy_data/checkins')
@@ -242,69 +446,76 @@ def migrate_checkins():
         print("No checkins directory found")
         return 0
     
-    # Load client map
-    client_map = {}
-    if os.path.exists('client_map.json'):
-        with open('client_map.json', 'r') as f:
-            client_map = json.load(f)
+    # Load existing (client_id, checkin_date) pairs once instead of a SELECT per file
+    existing = set(map(tuple, db.session.execute(
+        select(DailyCheckin.client_id, DailyCheckin.checkin_date)
+        .where(DailyCheckin.client_id.in_(client_map.values()))
+    )))
+    # COPY bypasses column defaults, so stamp created_at here
+    created_at = datetime.utcnow()
+    buffer = io.StringIO()
+    errors = []
     
-    for patient_dir in checkins_dir.iterdir():
-        if not patient_dir.is_dir():
-            continue
+    # Parse files in worker processes; database writes stay on this process
+    with ProcessPoolExecutor() as executor:
+        with os.scandir(checkins_dir) as entries:
+            patient_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
         
-        patient_id = patient_dir.name
-        
-        # Skip if client not in map
-        if patient_id not in client_map:
-            print(f"Client {patient_id} not found in map, skipping check-ins...")
-            continue
-        
-        client_id = client_map[patient_id]
-        
-        for checkin_file in patient_dir.glob('checkin_*.json'):
-            try:
-                with open(checkin_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Extract date from filename or data
-                checkin_date = data.get('date')
-                if not checkin_date:
-                    # Try to extract from filename
-                    checkin_date = checkin_file.stem.replace('checkin_', '')
-                
+        for patient_dir in patient_dirs:
+            patient_id = patient_dir.name
+            
+            # Skip if client not in map
+            if patient_id not in client_map:
+                print(f"Client {patient_id} not found in map, skipping check-ins...")
+                continue
+            
+            client_id = client_map[patient_id]
+            
+            checkin_files = _scan_json_files(patient_dir.path, 'checkin_')
+            parsed, patient_errors = _parse_files(executor, parse_checkin_file, checkin_files)
+            errors.extend(patient_errors)
+            for checkin_file, row in parsed:
                 # Check if already exists
-                existing = DailyCheckin.query.filter_by(
-                    client_id=client_id,
-                    checkin_date=datetime.strptime(checkin_date, '%Y-%m-%d').date()
-                ).first()
-                
-                if existing:
+                key = (client_id, row['checkin_date'])
+                if key in existing:
                     continue
                 
-                # Create check-in
-                checkin = DailyCheckin(
-                    client_id=client_id,
-                    checkin_date=datetime.strptime(checkin_date, '%Y-%m-%d').date(),
-                    checkin_time=datetime.strptime(data.get('time', '12:00'), '%H:%M').time(),
-                    emotional_value=data.get('emotional', {}).get('value'),
-                    emotional_notes=data.get('emotional', {}).get('notes', ''),
-                    medication_value=data.get('medication', {}).get('value'),
-                    medication_notes=data.get('medication', {}).get('notes', ''),
-                    activity_value=data.get('activity', {}).get('value'),
-                    activity_notes=data.get('activity', {}).get('notes', '')
-                )
-                db.session.add(checkin)
+                # Queue check-in as one line of the COPY stream
+                row['client_id'] = client_id
+                row['created_at'] = created_at
+                buffer.write('\t'.join([_copy_field(row[column]) for column in CHECKIN_COPY_COLUMNS]))
+                buffer.write('\n')
+                existing.add(key)
                 count += 1
-                
-            except Exception as e:
-                print(f"Error migrating check-in {checkin_file}: {e}")
+    
+    # Stream every new check-in through a single COPY on the session's connection,
+    # so it commits together with the rest of the session
+    if count:
+        # Drop the plain (non-unique) indexes for the load and rebuild them after:
+        # one sorted build is cheaper than updating them row by row. Unique and
+        # primary key indexes stay, they enforce constraints
+        plain_indexes = db.session.execute(text(
+            "SELECT x.indexrelid::regclass::text, pg_get_indexdef(x.indexrelid) "
+            "FROM pg_index x WHERE x.indrelid = CAST(:table AS regclass) AND NOT x.indisunique"
+        ), {'table': DailyCheckin.__tablename__}).all()
+        for index_name, _ in plain_indexes:
+            db.session.execute(text(f"DROP INDEX {index_name}"))
+        
+        buffer.seek(0)
+        cursor = db.session.connection().connection.cursor()
+        cursor.copy_expert(
+            f"COPY {DailyCheckin.__tablename__} ({', '.join(CHECKIN_COPY_COLUMNS)}) FROM STDIN",
+            buffer
+        )
+        cursor.close()
+        
+        for _, index_definition in plain_indexes:
+            db.session.execute(text(index_definition))
     
     db.session.commit()
     
-    # Clean up temporary files
-    for temp_file in ['therapist_map.json', 'client_map.json']:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+    for checkin_file, error in errors:
+        print(f"Error migrating check-in {checkin_file}: {error}")
     
     return count
 
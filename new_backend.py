@@ -2,20 +2,30 @@
 Enhanced Therapeutic Companion Backend
 With PostgreSQL, Authentication, Role-Based Access, and Client Reports
 """
-import random
-import string
-from flask import Flask, request, jsonify, send_file, session
+from flask import Flask, request, jsonify, send_file, session, g, has_request_context
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from collections import Counter, defaultdict
 from functools import wraps
 import os
+import sys
 from pathlib import Path
 import secrets
+import base64
+import hashlib
+import hmac
+import json
 import jwt
+import orjson
 from datetime import datetime, timedelta, date
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, event, exists, func, inspect, insert, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 import smtplib
@@ -24,6 +34,9 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from io import BytesIO
+import threading
+import time
+from cachetools import TLRUCache, TTLCache
 
 # Create Flask app
 app = Flask(__name__)
@@ -42,6 +55,9 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SESSION_COOKIE_SECURE'] = os.environ.get('PRODUCTION', False)
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+# bcrypt cost factor; each +1 doubles hashing time (~250 ms at 12), so local
+# development can lower it through the environment
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
 
 # Email configuration
 app.config['MAIL_SERVER'] = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
@@ -54,10 +70,20 @@ app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('SYSTEM_EMAIL')
 
 # Database connection pooling - ADD THIS SECTION
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_size': 5,
+    # Sized per worker process; raise via env when running more threads/greenlets
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+    'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+    'pool_timeout': 30,  # Fail a checkout after 30 seconds instead of hanging
     'pool_recycle': 300,  # Recycle connections after 5 minutes
     'pool_pre_ping': True,  # Test connections before using them
-    'max_overflow': 10,
+    # Compiled SQL cache; multi-row upsert VALUES compile once per row count,
+    # which puts the endpoints' distinct statements near the default 500
+    'query_cache_size': 1200,
+    # psycopg2 fast-execution helpers: INSERT executemany goes out as multi-row
+    # VALUES pages, UPDATE/DELETE executemany through execute_batch
+    'executemany_mode': 'values_plus_batch',
+    'executemany_batch_page_size': 500,
+    'insertmanyvalues_page_size': 1000,
     'connect_args': {
         'connect_timeout': 10,
         'options': '-c statement_timeout=30000'  # 30 second statement timeout
@@ -78,6 +104,57 @@ JWT_SECRET = app.config['SECRET_KEY']
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Our tokens always start with the same base64url header segment; tokens that
+# match it are verified directly with hmac (see _decode_own_token)
+_JWT_HEADER_SEGMENT = jwt.encode({}, JWT_SECRET, algorithm=JWT_ALGORITHM).partition('.')[0]
+_JWT_KEY = JWT_SECRET.encode('utf-8')
+_NOT_OWN_TOKEN = object()
+# Fixed PyJWT arguments for the other tokens, built once; 'exp' is required
+# there as in _decode_own_token
+_JWT_ALGORITHMS = (JWT_ALGORITHM,)
+_JWT_DECODE_OPTIONS = {'require': ['exp']}
+
+# users.last_login is only rewritten when the stored value is older than this
+LAST_LOGIN_RESOLUTION = timedelta(minutes=5)
+
+# Authenticated user rows cached per process so require_auth does not query
+# users on every API call; entries expire after 5 minutes, which bounds how
+# long a deactivated account keeps passing the is_active check
+AUTH_USER_CACHE_TTL = 300
+_auth_user_cache = TTLCache(maxsize=10000, ttl=AUTH_USER_CACHE_TTL)
+_auth_user_cache_lock = threading.Lock()
+
+# Decoded JWT payloads, so repeat calls with the same token skip the HMAC check
+# and JSON decode; an entry never outlives the token's own 'exp'. Keyed by the
+# token's SHA-256 digest so the cache holds no usable bearer tokens
+TOKEN_CACHE_TTL = 60
+_token_cache = TLRUCache(
+    maxsize=50000,
+    ttu=lambda _key, payload, now: min(now + TOKEN_CACHE_TTL, payload['exp']),
+    timer=time.time
+)
+_token_cache_lock = threading.Lock()
+
+# Recently verified passwords (see check_password); off unless enabled
+USE_VERIFY_PASSWORD_CACHE = os.environ.get('USE_VERIFY_PASSWORD_CACHE', 'false').lower() == 'true'
+VERIFY_PASSWORD_CACHE_TTL = 30
+_verified_password_cache = TTLCache(maxsize=1000, ttl=VERIFY_PASSWORD_CACHE_TTL)
+_verified_password_cache_lock = threading.Lock()
+
+# Per-client dashboard/progress payloads, dropped by the writes that change
+# them (submit_checkin, add_weekly_goal). The cache is per process, so the
+# short TTL bounds how stale another worker's copy can get.
+CLIENT_VIEW_CACHE_TTL = 60
+_client_view_cache = TTLCache(maxsize=4096, ttl=CLIENT_VIEW_CACHE_TTL)
+_client_view_cache_lock = threading.Lock()
+
+# Tracking categories are a handful of rows that change only when the table
+# is seeded, so the default IDs and the id -> (name, description) map are
+# cached instead of being queried or joined on every request
+CATEGORY_CACHE_TTL = 600
+_category_cache = TTLCache(maxsize=2, ttl=CATEGORY_CACHE_TTL)
+_category_cache_lock = threading.Lock()
+
 
 # ============= DATABASE MODELS =============
 
@@ -110,7 +187,7 @@ class Therapist(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
-    clients = db.relationship('Client', backref='therapist', lazy='dynamic')
+    clients = db.relationship('Client', backref='therapist')
     notes = db.relationship('TherapistNote', backref='therapist', lazy='dynamic')
 
 
@@ -132,6 +209,8 @@ class Client(db.Model):
     goals = db.relationship('WeeklyGoal', backref='client', lazy='dynamic', cascade='all, delete-orphan')
     reminders = db.relationship('Reminder', backref='client', lazy='dynamic', cascade='all, delete-orphan')
 
+    __table_args__ = (db.Index('idx_clients_therapist_active', 'therapist_id', 'is_active'),)
+
 
 class TrackingCategory(db.Model):
     __tablename__ = 'tracking_categories'
@@ -155,6 +234,8 @@ class ClientTrackingPlan(db.Model):
 
     category = db.relationship('TrackingCategory', backref='client_plans')
 
+    __table_args__ = (db.Index('idx_tracking_plans_client_active', 'client_id', 'is_active'),)
+
 
 class WeeklyGoal(db.Model):
     __tablename__ = 'weekly_goals'
@@ -169,6 +250,8 @@ class WeeklyGoal(db.Model):
 
     completions = db.relationship('GoalCompletion', backref='goal', lazy='dynamic', cascade='all, delete-orphan')
 
+    __table_args__ = (db.Index('idx_weekly_goals_client_week', 'client_id', 'week_start', 'is_active'),)
+
 
 class DailyCheckin(db.Model):
     __tablename__ = 'daily_checkins'
@@ -185,7 +268,13 @@ class DailyCheckin(db.Model):
     activity_notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint('client_id', 'checkin_date'),)
+    __table_args__ = (
+        db.UniqueConstraint('client_id', 'checkin_date'),
+        # Covers "latest check-ins for a client" reads so they can be answered
+        # by an index-only scan without visiting the heap
+        db.Index('idx_checkins_client_date_covering', 'client_id', checkin_date.desc(),
+                 postgresql_include=['emotional_value', 'medication_value', 'activity_value']),
+    )
 
 
 class CategoryResponse(db.Model):
@@ -201,6 +290,12 @@ class CategoryResponse(db.Model):
 
     category = db.relationship('TrackingCategory', backref='responses')
 
+    # One response per client, category and day; submit_checkin upserts on it
+    __table_args__ = (
+        db.Index('uq_category_responses_client_category_date', 'client_id', 'category_id', 'response_date',
+                 unique=True),
+    )
+
 
 class GoalCompletion(db.Model):
     __tablename__ = 'goal_completions'
@@ -252,6 +347,12 @@ class TherapistNote(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
 
+    __table_args__ = (
+        db.Index('idx_therapist_notes_missions', 'therapist_id', 'is_mission', 'mission_completed'),
+        # Latest notes for a client (client details) and a week's notes (reports)
+        db.Index('idx_therapist_notes_client', 'client_id', 'therapist_id', created_at.desc()),
+    )
+
 
 class SessionToken(db.Model):
     __tablename__ = 'session_tokens'
@@ -263,8 +364,60 @@ class SessionToken(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
+# Columns a resubmitted check-in overwrites (created_at keeps the first submission)
+CHECKIN_UPSERT_COLUMNS = (
+    'checkin_time', 'emotional_value', 'emotional_notes', 'medication_value',
+    'medication_notes', 'activity_value', 'activity_notes'
+)
+
+
 # ============= AUTHENTICATION HELPERS =============
 
+def run_blocking(func, *args):
+    """Run a CPU-bound call (password hashing, workbook serialization) without stalling the worker
+
+    Under the gevent worker the call is handed to the hub's native thread
+    pool, so other greenlets keep running; elsewhere it runs inline.
+    """
+    if 'gevent' in sys.modules:
+        from gevent import monkey, get_hub
+        if monkey.is_module_patched('threading'):
+            return get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+
+def hash_password(password):
+    """Hash a password with bcrypt
+
+    bcrypt releases the GIL while hashing, so with run_blocking() other
+    requests keep being served during the KDF under both the gevent and
+    the threaded Gunicorn workers.
+    """
+    return run_blocking(bcrypt.generate_password_hash, password).decode('utf-8')
+
+
+def check_password(password_hash, password):
+    """Check a password against its bcrypt hash
+
+    With USE_VERIFY_PASSWORD_CACHE set, a successful check is remembered for
+    VERIFY_PASSWORD_CACHE_TTL seconds so rapid repeat logins skip bcrypt.
+    The key is an HMAC over the stored hash and the password, so a password
+    change invalidates it; failures are never cached.
+    """
+    if not USE_VERIFY_PASSWORD_CACHE:
+        return run_blocking(bcrypt.check_password_hash, password_hash, password)
+
+    cache_key = hmac.new(_JWT_KEY, f'{password_hash}:{password}'.encode('utf-8'), hashlib.sha256).digest()
+    with _verified_password_cache_lock:
+        if cache_key in _verified_password_cache:
+            return True
+    valid = run_blocking(bcrypt.check_password_hash, password_hash, password)
+    if valid:
+        with _verified_password_cache_lock:
+            _verified_password_cache[cache_key] = True
+    return valid
+
+
 def generate_token(user_id, role):
     """Generate JWT token"""
     payload = {
@@ -272,13 +425,56 @@ def generate_token(user_id, role):
         'role': role,
         'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALGORITHM)
+
+
+def _decode_own_token(token):
+    """Verify a token carrying exactly the header generate_token() emits
+
+    Returns the payload, None for a bad signature or expired token, or
+    _NOT_OWN_TOKEN when the header differs and PyJWT must decide. Only the
+    fixed HS256 header is accepted here, so there is no algorithm to
+    negotiate; the HMAC runs in OpenSSL via hmac.digest.
+    """
+    header, _, rest = token.partition('.')
+    if header != _JWT_HEADER_SEGMENT:
+        return _NOT_OWN_TOKEN
+    body, _, signature = rest.partition('.')
+    if not body or not signature or '.' in signature:
+        return None
+    try:
+        expected = hmac.digest(_JWT_KEY, f'{header}.{body}'.encode('ascii'), 'sha256')
+        if not hmac.compare_digest(expected, base64.urlsafe_b64decode(signature + '=' * (-len(signature) % 4))):
+            return None
+        payload = json.loads(base64.urlsafe_b64decode(body + '=' * (-len(body) % 4)))
+    except (ValueError, UnicodeError):
+        return None
+    exp = payload.get('exp') if isinstance(payload, dict) else None
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return None
+    return payload
 
 
 def verify_token(token):
     """Verify JWT token"""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    payload = _decode_own_token(token)
+    if payload is None:
+        return None
+    if payload is not _NOT_OWN_TOKEN:
+        with _token_cache_lock:
+            _token_cache[cache_key] = payload
+        return payload
+
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
+        with _token_cache_lock:
+            _token_cache[cache_key] = payload
         return payload
     except jwt.ExpiredSignatureError:
         return None
@@ -286,6 +482,31 @@ def verify_token(token):
         return None
 
 
+def load_auth_user(user_id):
+    """Load the user for an authenticated request, served from the cache when possible"""
+    with _auth_user_cache_lock:
+        cached = _auth_user_cache.get(user_id)
+
+    if cached is None:
+        user = db.session.get(User, user_id)
+        if user:
+            with _auth_user_cache_lock:
+                _auth_user_cache[user_id] = (user.email, user.role, user.is_active)
+        return user
+
+    user = db.session.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        return user
+
+    # Re-attach a detached copy built from the cached columns; anything not
+    # cached (password hash, timestamps) is loaded only if a handler asks for it
+    email, role, is_active = cached
+    user = User(id=user_id, email=email, role=role, is_active=is_active)
+    make_transient_to_detached(user)
+    db.session.add(user)
+    return user
+
+
 def require_auth(allowed_roles=None):
     """Authentication decorator"""
 
@@ -303,7 +524,7 @@ def require_auth(allowed_roles=None):
                 return jsonify({'error': 'Invalid or expired token'}), 401
 
             # Check if user exists and is active
-            user = User.query.get(payload['user_id'])
+            user = load_auth_user(payload['user_id'])
             if not user or not user.is_active:
                 return jsonify({'error': 'User not found or inactive'}), 401
 
@@ -324,83 +545,213 @@ def require_auth(allowed_roles=None):
 
 
 def generate_client_serial():
-    """Generate unique client serial number"""
-    import random
-    import string
-    while True:
-        serial = 'C' + ''.join(random.choices(string.digits, k=8))
-        if not Client.query.filter_by(client_serial=serial).first():
-            return serial
+    """Generate unique client serial number
+
+    40 random bits make a collision vanishingly unlikely, so no lookup is
+    made here; the UNIQUE constraint on client_serial rejects the insert
+    in the rare case one happens and add_client retries with a new serial.
+    """
+    return 'C' + secrets.token_hex(5).upper()
+
+
+CLIENT_SERIAL_ATTEMPTS = 3
+CLIENT_SERIAL_CONSTRAINT = 'clients_client_serial_key'
+
+
+def add_client(user, **fields):
+    """Insert a new client for user, drawing a fresh serial if one is already taken
+
+    Each attempt runs under a SAVEPOINT so a serial collision only undoes
+    the client insert, not the rest of the request's transaction.
+    """
+    # Insert the user (and anything else pending) outside the savepoint
+    db.session.flush()
+    for attempt in range(CLIENT_SERIAL_ATTEMPTS):
+        client = Client(user_id=user.id, client_serial=generate_client_serial(), **fields)
+        try:
+            with db.session.begin_nested():
+                db.session.add(client)
+        except IntegrityError as e:
+            constraint = getattr(getattr(e.orig, 'diag', None), 'constraint_name', None)
+            if constraint != CLIENT_SERIAL_CONSTRAINT or attempt == CLIENT_SERIAL_ATTEMPTS - 1:
+                raise
+            app.logger.warning("Client serial collision, retrying (%d/%d)", attempt + 1, CLIENT_SERIAL_ATTEMPTS)
+            continue
+        return client
+
+
+def default_category_ids():
+    """IDs of the default tracking categories, cached for CATEGORY_CACHE_TTL seconds"""
+    with _category_cache_lock:
+        category_ids = _category_cache.get('default_ids')
+    if category_ids is None:
+        category_ids = tuple(
+            category_id for (category_id,) in db.session.query(TrackingCategory.id).filter_by(
+                is_default=True
+            ).order_by(TrackingCategory.id)
+        )
+        # Don't remember an empty list while the categories are still being seeded
+        if category_ids:
+            with _category_cache_lock:
+                _category_cache['default_ids'] = category_ids
+    return category_ids
+
+
+def tracking_categories_by_id(required_ids=()):
+    """Map of tracking category id -> (name, description), cached for CATEGORY_CACHE_TTL seconds
+
+    The map is reloaded early if any of required_ids is missing from it,
+    so a category added since the last load is never reported as unknown.
+    """
+    with _category_cache_lock:
+        categories = _category_cache.get('by_id')
+    if categories is None or any(category_id not in categories for category_id in required_ids):
+        categories = {
+            category_id: (name, description)
+            for category_id, name, description in db.session.query(
+                TrackingCategory.id, TrackingCategory.name, TrackingCategory.description
+            )
+        }
+        if categories:
+            with _category_cache_lock:
+                _category_cache['by_id'] = categories
+    return categories
+
+
+def parse_week(week):
+    """Parse an ISO week string such as '2024-W07' (the HTML week input format)
+
+    Returns (year, week_num, week_start) with week_start the Monday of that
+    week as a datetime at midnight. Raises ValueError for malformed input.
+    """
+    year, week_num = week.split('-W')
+    year = int(year)
+    week_num = int(week_num)
+    return year, week_num, datetime.fromisocalendar(year, week_num, 1)
+
+
+def week_completions_by_goal(goals, week_days):
+    """Map of goal id -> {completion_date: completed} over week_days, in one range query"""
+    completed_by_goal = {goal.id: {} for goal in goals}
+    if goals:
+        for goal_id, completion_date, completed in db.session.query(
+                GoalCompletion.goal_id, GoalCompletion.completion_date, GoalCompletion.completed
+        ).filter(
+            GoalCompletion.goal_id.in_(completed_by_goal),
+            GoalCompletion.completion_date.between(week_days[0], week_days[-1])
+        ):
+            completed_by_goal[goal_id][completion_date] = completed
+    return completed_by_goal
+
+
+def count_completed_days(goals, week_start, week_end):
+    """Map of goal id -> days marked completed between week_start and week_end, in one query"""
+    return dict(db.session.query(
+        GoalCompletion.goal_id, func.count()
+    ).filter(
+        GoalCompletion.goal_id.in_([goal.id for goal in goals]),
+        GoalCompletion.completion_date.between(week_start.date(), week_end.date()),
+        GoalCompletion.completed == True
+    ).group_by(GoalCompletion.goal_id).all())
+
+
+def fast_jsonify(obj):
+    """jsonify() for large payloads, encoded with orjson
+
+    Keys are sorted like Flask's JSON provider, and date/datetime values are
+    written as ISO strings, so the wire format matches jsonify().
+    """
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS), mimetype='application/json')
+
+
+def conditional_response(response):
+    """Tag a response with an ETag of its body and answer 304 if the client already has it"""
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def get_client_view(client_id, key):
+    """Cached payload for one of a client's views, or None"""
+    with _client_view_cache_lock:
+        return _client_view_cache.get(client_id, {}).get(key)
+
+
+def store_client_view(client_id, key, payload):
+    """Remember a client view payload (keys carry the date they were built for)"""
+    with _client_view_cache_lock:
+        views = _client_view_cache.get(client_id)
+        if views is None:
+            views = _client_view_cache[client_id] = {}
+        views[key] = payload
+
+
+def invalidate_client_views(client_id):
+    """Drop every cached view of a client after its data changed"""
+    with _client_view_cache_lock:
+        _client_view_cache.pop(client_id, None)
 
 
 # ============= HTML PAGE ROUTES =============
 
-@app.route('/')
-def index():
-    """Serve the main HTML file"""
+# Pages are sent with ETag/Last-Modified (Flask's defaults) plus a short
+# Cache-Control max-age, so browsers reuse them or revalidate with a 304
+HTML_MAX_AGE = 300
+
+
+def _resolve_page(*filenames):
+    """Path of the first of filenames present in BASE_DIR, or None"""
+    for filename in filenames:
+        path = os.path.join(BASE_DIR, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# Page files are looked up once at startup (dashboards also under their
+# hyphenated names) instead of being checked on every request
+HTML_PAGES = {
+    'index.html': _resolve_page('index.html'),
+    'login.html': _resolve_page('login.html'),
+    'therapist_dashboard.html': _resolve_page('therapist_dashboard.html', 'therapist-dashboard.html'),
+    'client_dashboard.html': _resolve_page('client_dashboard.html', 'client-dashboard.html'),
+}
+
+
+def send_page(filename):
+    """Send one of HTML_PAGES, or a 404 if it was missing at startup"""
     try:
-        file_path = os.path.join(BASE_DIR, 'index.html')
-        if os.path.exists(file_path):
-            return send_file(file_path)
-        else:
-            app.logger.error(f"index.html not found at {file_path}")
-            return "index.html not found", 404
+        path = HTML_PAGES[filename]
+        if path is None:
+            app.logger.error(f"{filename} not found in {BASE_DIR}")
+            return f"{filename} not found", 404
+        return send_file(path, max_age=HTML_MAX_AGE)
     except Exception as e:
-        app.logger.error(f"Error serving index.html: {e}")
+        app.logger.error(f"Error serving {filename}: {e}")
         return f"Error: {str(e)}", 500
 
 
+@app.route('/')
+def index():
+    """Serve the main HTML file"""
+    return send_page('index.html')
+
+
 @app.route('/login.html')
 def login_page():
     """Serve the login HTML file"""
-    try:
-        file_path = os.path.join(BASE_DIR, 'login.html')
-        if os.path.exists(file_path):
-            return send_file(file_path)
-        else:
-            app.logger.error(f"login.html not found at {file_path}")
-            return "login.html not found", 404
-    except Exception as e:
-        app.logger.error(f"Error serving login.html: {e}")
-        return f"Error: {str(e)}", 500
+    return send_page('login.html')
 
 
 @app.route('/therapist-dashboard.html')
 def therapist_dashboard_page():
     """Serve the therapist dashboard HTML file"""
-    try:
-        file_path = os.path.join(BASE_DIR, 'therapist_dashboard.html')
-        if os.path.exists(file_path):
-            return send_file(file_path)
-        else:
-            # Try alternative filename
-            alt_path = os.path.join(BASE_DIR, 'therapist-dashboard.html')
-            if os.path.exists(alt_path):
-                return send_file(alt_path)
-            app.logger.error(f"therapist_dashboard.html not found at {file_path}")
-            return "therapist_dashboard.html not found", 404
-    except Exception as e:
-        app.logger.error(f"Error serving therapist_dashboard.html: {e}")
-        return f"Error: {str(e)}", 500
+    return send_page('therapist_dashboard.html')
 
 
 @app.route('/client-dashboard.html')
 def client_dashboard_page():
     """Serve the client dashboard HTML file"""
-    try:
-        file_path = os.path.join(BASE_DIR, 'client_dashboard.html')
-        if os.path.exists(file_path):
-            return send_file(file_path)
-        else:
-            # Try alternative filename
-            alt_path = os.path.join(BASE_DIR, 'client-dashboard.html')
-            if os.path.exists(alt_path):
-                return send_file(alt_path)
-            app.logger.error(f"client_dashboard.html not found at {file_path}")
-            return "client_dashboard.html not found", 404
-    except Exception as e:
-        app.logger.error(f"Error serving client_dashboard.html: {e}")
-        return f"Error: {str(e)}", 500
+    return send_page('client_dashboard.html')
 
 
 # ============= API ENDPOINTS =============
@@ -428,16 +779,16 @@ def register():
         # Create user
         user = User(
             email=email,
-            password_hash=bcrypt.generate_password_hash(password).decode('utf-8'),
+            password_hash=hash_password(password),
             role=role
         )
         db.session.add(user)
-        db.session.flush()
 
-        # Create role-specific profile
+        # Create role-specific profile; linking it through the relationship
+        # lets one flush insert the user and profile together
         if role == 'therapist':
             therapist = Therapist(
-                user_id=user.id,
+                user=user,
                 license_number=data.get('license_number', ''),
                 name=data.get('name', ''),
                 organization=data.get('organization', ''),
@@ -445,22 +796,19 @@ def register():
             )
             db.session.add(therapist)
         else:  # client
-            client = Client(
-                user_id=user.id,
-                client_serial=generate_client_serial(),
+            client = add_client(
+                user,
                 therapist_id=data.get('therapist_id'),
                 start_date=date.today()
             )
-            db.session.add(client)
-
-            # Add default tracking categories
-            default_categories = TrackingCategory.query.filter_by(is_default=True).all()
-            for category in default_categories:
-                plan = ClientTrackingPlan(
-                    client_id=client.id,
-                    category_id=category.id
-                )
-                db.session.add(plan)
+
+            # Add default tracking categories (single multi-row INSERT)
+            category_ids = default_category_ids()
+            if category_ids:
+                db.session.execute(insert(ClientTrackingPlan), [
+                    {'client_id': client.id, 'category_id': category_id}
+                    for category_id in category_ids
+                ])
 
         db.session.commit()
 
@@ -493,18 +841,17 @@ def login():
         if not all([email, password]):
             return jsonify({'error': 'Missing email or password'}), 400
 
-        # Find user
-        user = User.query.filter_by(email=email).first()
-        if not user or not bcrypt.check_password_hash(user.password_hash, password):
+        # Find user, with both role profiles joined in so the response below
+        # needs no further queries
+        user = User.query.options(
+            joinedload(User.therapist), joinedload(User.client)
+        ).filter_by(email=email).first()
+        if not user or not check_password(user.password_hash, password):
             return jsonify({'error': 'Invalid credentials'}), 401
 
         if not user.is_active:
             return jsonify({'error': 'Account deactivated'}), 401
 
-        # Update last login
-        user.last_login = datetime.utcnow()
-        db.session.commit()
-
         # Generate token
         token = generate_token(user.id, user.role)
 
@@ -533,6 +880,14 @@ def login():
                 'start_date': user.client.start_date.isoformat()
             }
 
+        # Update last login; repeated logins within LAST_LOGIN_RESOLUTION
+        # skip the write (and its commit) entirely. Done last because the
+        # commit expires the loaded user and profile
+        now = datetime.utcnow()
+        if not user.last_login or now - user.last_login > LAST_LOGIN_RESOLUTION:
+            user.last_login = now
+            db.session.commit()
+
         return jsonify(response_data)
 
     except Exception as e:
@@ -548,22 +903,31 @@ def therapist_dashboard():
     try:
         therapist = request.current_user.therapist
 
+        # The statistics below are built as subqueries and fetched together in
+        # one statement, so the dashboard costs a single round trip
+
         # Get client statistics
-        total_clients = therapist.clients.count()
-        active_clients = therapist.clients.filter_by(is_active=True).count()
+        client_counts = select(
+            func.count().label('total'),
+            func.count().filter(Client.is_active == True).label('active')
+        ).where(Client.therapist_id == therapist.id).subquery()
 
         # Get recent activity
-        recent_checkins = db.session.query(DailyCheckin).join(Client).filter(
+        recent_checkins = select(func.count()).select_from(DailyCheckin).join(Client).where(
             Client.therapist_id == therapist.id,
             DailyCheckin.checkin_date >= date.today() - timedelta(days=7)
-        ).count()
+        ).scalar_subquery()
 
         # Get pending missions
-        pending_missions = TherapistNote.query.filter_by(
-            therapist_id=therapist.id,
-            is_mission=True,
-            mission_completed=False
-        ).count()
+        pending_missions = select(func.count()).select_from(TherapistNote).where(
+            TherapistNote.therapist_id == therapist.id,
+            TherapistNote.is_mission == True,
+            TherapistNote.mission_completed == False
+        ).scalar_subquery()
+
+        total_clients, active_clients, recent_checkins, pending_missions = db.session.execute(
+            select(client_counts.c.total, client_counts.c.active, recent_checkins, pending_missions)
+        ).one()
 
         return jsonify({
             'success': True,
@@ -595,13 +959,37 @@ def get_therapist_clients():
         status = request.args.get('status', 'all')
         sort_by = request.args.get('sort_by', 'start_date')
 
+        # Last check-in and this week's check-in count come from one grouped
+        # subquery joined back by client_id, and each client's active tracking
+        # categories from a correlated array_agg, so the list is one statement
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
+        checkin_stats = select(
+            DailyCheckin.client_id,
+            func.max(DailyCheckin.checkin_date).label('last_checkin'),
+            func.count().filter(DailyCheckin.checkin_date >= week_start).label('week_checkins')
+        ).where(
+            DailyCheckin.client_id.in_(select(Client.id).where(Client.therapist_id == therapist.id))
+        ).group_by(DailyCheckin.client_id).subquery()
+
+        plan_category_ids = select(
+            func.array_agg(aggregate_order_by(ClientTrackingPlan.category_id, ClientTrackingPlan.id))
+        ).where(
+            ClientTrackingPlan.client_id == Client.id,
+            ClientTrackingPlan.is_active == True
+        ).scalar_subquery()
+
         # Build query
-        query = therapist.clients
+        query = db.session.query(
+            Client, checkin_stats.c.last_checkin, checkin_stats.c.week_checkins, plan_category_ids
+        ).outerjoin(
+            checkin_stats, checkin_stats.c.client_id == Client.id
+        ).filter(Client.therapist_id == therapist.id)
 
         if status == 'active':
-            query = query.filter_by(is_active=True)
+            query = query.filter(Client.is_active == True)
         elif status == 'inactive':
-            query = query.filter_by(is_active=False)
+            query = query.filter(Client.is_active == False)
 
         # Sort
         if sort_by == 'start_date':
@@ -609,30 +997,23 @@ def get_therapist_clients():
         elif sort_by == 'serial':
             query = query.order_by(Client.client_serial)
 
-        clients = query.all()
+        rows = query.all()
+        categories = tracking_categories_by_id({
+            category_id for *_, category_ids in rows for category_id in category_ids or ()
+        })
 
         # Build response
         client_data = []
-        for client in clients:
-            # Get last check-in
-            last_checkin = client.checkins.order_by(DailyCheckin.checkin_date.desc()).first()
-
-            # Get completion rate for last week
-            week_start = date.today() - timedelta(days=date.today().weekday())
-            week_checkins = client.checkins.filter(
-                DailyCheckin.checkin_date >= week_start
-            ).count()
+        for client, last_checkin, week_checkins, category_ids in rows:
 
             client_data.append({
                 'id': client.id,
                 'serial': client.client_serial,
                 'start_date': client.start_date.isoformat(),
                 'is_active': client.is_active,
-                'last_checkin': last_checkin.checkin_date.isoformat() if last_checkin else None,
-                'week_completion': f"{week_checkins}/7",
-                'tracking_categories': [
-                    plan.category.name for plan in client.tracking_plans.filter_by(is_active=True)
-                ]
+                'last_checkin': last_checkin.isoformat() if last_checkin else None,
+                'week_completion': f"{week_checkins or 0}/7",
+                'tracking_categories': [categories[category_id][0] for category_id in category_ids or ()]
             })
 
         return jsonify({
@@ -662,26 +1043,32 @@ def get_client_details(client_id):
 
         # Get tracking plans
         tracking_plans = []
-        for plan in client.tracking_plans.filter_by(is_active=True):
+        plans = client.tracking_plans.filter_by(is_active=True).all()
+        categories = tracking_categories_by_id({plan.category_id for plan in plans})
+        for plan in plans:
+            name, description = categories[plan.category_id]
             tracking_plans.append({
                 'id': plan.id,
-                'category': plan.category.name,
-                'description': plan.category.description
+                'category': name,
+                'description': description
             })
 
         # Get active goals
         active_goals = []
-        week_start = date.today() - timedelta(days=date.today().weekday())
-        for goal in client.goals.filter_by(
-                week_start=week_start,
-                is_active=True
-        ):
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
+        week_days = [week_start + timedelta(days=i) for i in range(7)]
+        goals = client.goals.filter_by(
+            week_start=week_start,
+            is_active=True
+        ).all()
+
+        completed_by_goal = week_completions_by_goal(goals, week_days)
+
+        for goal in goals:
             # Get completions for this week
-            completions = {}
-            for i in range(7):
-                day = week_start + timedelta(days=i)
-                completion = goal.completions.filter_by(completion_date=day).first()
-                completions[day.isoformat()] = completion.completed if completion else None
+            goal_completions = completed_by_goal[goal.id]
+            completions = {day.isoformat(): goal_completions.get(day) for day in week_days}
 
             active_goals.append({
                 'id': goal.id,
@@ -689,9 +1076,14 @@ def get_client_details(client_id):
                 'completions': completions
             })
 
-        # Get recent check-ins
+        # Get recent check-ins (only the rated columns, not the free-text notes)
         recent_checkins = []
-        for checkin in client.checkins.order_by(
+        for checkin in client.checkins.with_entities(
+                DailyCheckin.checkin_date,
+                DailyCheckin.emotional_value,
+                DailyCheckin.medication_value,
+                DailyCheckin.activity_value
+        ).order_by(
                 DailyCheckin.checkin_date.desc()
         ).limit(7):
             recent_checkins.append({
@@ -752,47 +1144,44 @@ def create_client():
         # Create user
         user = User(
             email=email,
-            password_hash=bcrypt.generate_password_hash(password).decode('utf-8'),
+            password_hash=hash_password(password),
             role='client'
         )
         db.session.add(user)
-        db.session.flush()
 
         # Create client
-        client = Client(
-            user_id=user.id,
-            client_serial=generate_client_serial(),
+        today = date.today()
+        client = add_client(
+            user,
             therapist_id=therapist.id,
-            start_date=date.today()
+            start_date=today
         )
-        db.session.add(client)
-        db.session.flush()
 
         # Add tracking categories
         category_ids = data.get('tracking_categories', [])
         if not category_ids:
             # Add default categories
-            default_categories = TrackingCategory.query.filter_by(is_default=True).all()
-            category_ids = [cat.id for cat in default_categories]
+            category_ids = default_category_ids()
 
-        for cat_id in category_ids:
-            plan = ClientTrackingPlan(
-                client_id=client.id,
-                category_id=cat_id
-            )
-            db.session.add(plan)
+        if category_ids:
+            db.session.execute(insert(ClientTrackingPlan), [
+                {'client_id': client.id, 'category_id': cat_id}
+                for cat_id in category_ids
+            ])
 
-        # Add initial goals if provided
+        # Add initial goals if provided (single multi-row INSERT)
         goals = data.get('initial_goals', [])
-        week_start = date.today() - timedelta(days=date.today().weekday())
-        for goal_text in goals:
-            goal = WeeklyGoal(
-                client_id=client.id,
-                therapist_id=therapist.id,
-                goal_text=goal_text,
-                week_start=week_start
-            )
-            db.session.add(goal)
+        week_start = today - timedelta(days=today.weekday())
+        if goals:
+            db.session.execute(insert(WeeklyGoal), [
+                {
+                    'client_id': client.id,
+                    'therapist_id': therapist.id,
+                    'goal_text': goal_text,
+                    'week_start': week_start
+                }
+                for goal_text in goals
+            ])
 
         # Add welcome note
         welcome_note = TherapistNote(
@@ -843,10 +1232,11 @@ def add_weekly_goal():
 
         # Parse week start
         if week_start_str:
-            week_start = datetime.strptime(week_start_str, '%Y-%m-%d').date()
+            week_start = date.fromisoformat(week_start_str)
         else:
             # Default to current week
-            week_start = date.today() - timedelta(days=date.today().weekday())
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday())
 
         # Create goal
         goal = WeeklyGoal(
@@ -857,6 +1247,7 @@ def add_weekly_goal():
         )
         db.session.add(goal)
         db.session.commit()
+        invalidate_client_views(client.id)
 
         return jsonify({
             'success': True,
@@ -928,67 +1319,107 @@ def client_dashboard():
     """Get client dashboard data"""
     try:
         client = request.current_user.client
+        today = date.today()
+
+        cached = get_client_view(client.id, ('dashboard', today))
+        if cached is not None:
+            return jsonify(cached)
+
+        # Today's check-in flag and the plan, goal and reminder lists are
+        # built as subqueries (lists aggregated to JSON arrays) and fetched
+        # together in one statement, so the dashboard costs a single round trip
+        week_start = today - timedelta(days=today.weekday())
 
         # Get today's check-in status
-        today_checkin = client.checkins.filter_by(checkin_date=date.today()).first()
+        checkin_exists = exists().where(
+            DailyCheckin.client_id == client.id,
+            DailyCheckin.checkin_date == today
+        )
 
-        # Get active tracking categories
-        tracking_categories = []
-        for plan in client.tracking_plans.filter_by(is_active=True):
-            # Get today's response
-            today_response = CategoryResponse.query.filter_by(
-                client_id=client.id,
-                category_id=plan.category_id,
-                response_date=date.today()
-            ).first()
+        # Get active tracking categories with today's response; (client_id,
+        # category_id, response_date) is unique, so each plan appears once
+        plan_rows = select(func.json_agg(aggregate_order_by(
+            func.json_build_array(ClientTrackingPlan.category_id, CategoryResponse.value),
+            ClientTrackingPlan.id
+        ))).select_from(ClientTrackingPlan).outerjoin(CategoryResponse, and_(
+            CategoryResponse.client_id == ClientTrackingPlan.client_id,
+            CategoryResponse.category_id == ClientTrackingPlan.category_id,
+            CategoryResponse.response_date == today
+        )).where(
+            ClientTrackingPlan.client_id == client.id,
+            ClientTrackingPlan.is_active == True
+        ).scalar_subquery()
+
+        # Get this week's goals with today's completion; (goal_id,
+        # completion_date) is unique, so each goal appears once
+        goal_rows = select(func.json_agg(aggregate_order_by(
+            func.json_build_array(WeeklyGoal.id, WeeklyGoal.goal_text, GoalCompletion.completed),
+            WeeklyGoal.id
+        ))).select_from(WeeklyGoal).outerjoin(GoalCompletion, and_(
+            GoalCompletion.goal_id == WeeklyGoal.id,
+            GoalCompletion.completion_date == today
+        )).where(
+            WeeklyGoal.client_id == client.id,
+            WeeklyGoal.week_start == week_start,
+            WeeklyGoal.is_active == True
+        ).scalar_subquery()
 
+        # Get reminders
+        reminder_rows = select(func.json_agg(aggregate_order_by(
+            func.json_build_array(Reminder.reminder_type, func.to_char(Reminder.reminder_time, 'HH24:MI')),
+            Reminder.id
+        ))).where(
+            Reminder.client_id == client.id,
+            Reminder.is_active == True
+        ).scalar_subquery()
+
+        has_checkin, plan_rows, goal_rows, reminder_rows = db.session.execute(
+            select(checkin_exists, plan_rows, goal_rows, reminder_rows)
+        ).one()
+        plan_rows = plan_rows or []
+
+        categories = tracking_categories_by_id({category_id for category_id, _ in plan_rows})
+        tracking_categories = []
+        for category_id, today_value in plan_rows:
+            name, description = categories[category_id]
             tracking_categories.append({
-                'id': plan.category_id,
-                'name': plan.category.name,
-                'description': plan.category.description,
-                'today_value': today_response.value if today_response else None
+                'id': category_id,
+                'name': name,
+                'description': description,
+                'today_value': today_value
             })
 
-        # Get this week's goals
-        week_start = date.today() - timedelta(days=date.today().weekday())
         weekly_goals = []
-        for goal in client.goals.filter_by(
-                week_start=week_start,
-                is_active=True
-        ):
-            # Get today's completion
-            today_completion = goal.completions.filter_by(
-                completion_date=date.today()
-            ).first()
-
+        for goal_id, goal_text, completed in goal_rows or []:
             weekly_goals.append({
-                'id': goal.id,
-                'text': goal.goal_text,
-                'today_completed': today_completion.completed if today_completion else None
+                'id': goal_id,
+                'text': goal_text,
+                'today_completed': completed
             })
 
-        # Get reminders
         reminders = []
-        for reminder in client.reminders.filter_by(is_active=True):
+        for reminder_type, reminder_time in reminder_rows or []:
             reminders.append({
-                'type': reminder.reminder_type,
-                'time': reminder.reminder_time.strftime('%H:%M')
+                'type': reminder_type,
+                'time': reminder_time
             })
 
-        return jsonify({
+        payload = {
             'success': True,
             'client': {
                 'serial': client.client_serial,
                 'start_date': client.start_date.isoformat()
             },
             'today': {
-                'has_checkin': today_checkin is not None,
-                'date': date.today().isoformat()
+                'has_checkin': has_checkin,
+                'date': today.isoformat()
             },
             'tracking_categories': tracking_categories,
             'weekly_goals': weekly_goals,
             'reminders': reminders
-        })
+        }
+        store_client_view(client.id, ('dashboard', today), payload)
+        return jsonify(payload)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1002,77 +1433,69 @@ def submit_checkin():
         client = request.current_user.client
         data = request.json
 
-        checkin_date = data.get('date', date.today().isoformat())
-        checkin_date = datetime.strptime(checkin_date, '%Y-%m-%d').date()
-
-        # Check if check-in exists
-        existing = client.checkins.filter_by(checkin_date=checkin_date).first()
-
-        if existing:
-            # Update existing
-            existing.checkin_time = datetime.now().time()
-            existing.emotional_value = data.get('emotional_value')
-            existing.emotional_notes = data.get('emotional_notes')
-            existing.medication_value = data.get('medication_value')
-            existing.medication_notes = data.get('medication_notes')
-            existing.activity_value = data.get('activity_value')
-            existing.activity_notes = data.get('activity_notes')
+        now = datetime.now()
+        checkin_date = data.get('date')
+        if checkin_date:
+            checkin_date = date.fromisoformat(checkin_date)
         else:
-            # Create new
-            checkin = DailyCheckin(
-                client_id=client.id,
-                checkin_date=checkin_date,
-                checkin_time=datetime.now().time(),
-                emotional_value=data.get('emotional_value'),
-                emotional_notes=data.get('emotional_notes'),
-                medication_value=data.get('medication_value'),
-                medication_notes=data.get('medication_notes'),
-                activity_value=data.get('activity_value'),
-                activity_notes=data.get('activity_notes')
-            )
-            db.session.add(checkin)
+            checkin_date = now.date()
 
-        # Save category responses
+        # Insert the day's check-in or overwrite the existing one in a single
+        # statement on the (client_id, checkin_date) unique constraint
+        stmt = pg_insert(DailyCheckin).values(
+            client_id=client.id,
+            checkin_date=checkin_date,
+            checkin_time=now.time(),
+            emotional_value=data.get('emotional_value'),
+            emotional_notes=data.get('emotional_notes'),
+            medication_value=data.get('medication_value'),
+            medication_notes=data.get('medication_notes'),
+            activity_value=data.get('activity_value'),
+            activity_notes=data.get('activity_notes')
+        )
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['client_id', 'checkin_date'],
+            set_={column: stmt.excluded[column] for column in CHECKIN_UPSERT_COLUMNS}
+        ))
+
+        # Save category responses: one INSERT ... ON CONFLICT DO UPDATE for
+        # all of them (keyed by category, so a repeated ID keeps its last value)
         category_responses = data.get('category_responses', {})
-        for cat_id, value in category_responses.items():
-            # Check if response exists
-            existing_response = CategoryResponse.query.filter_by(
-                client_id=client.id,
-                category_id=int(cat_id),
-                response_date=checkin_date
-            ).first()
-
-            if existing_response:
-                existing_response.value = value
-            else:
-                response = CategoryResponse(
-                    client_id=client.id,
-                    category_id=int(cat_id),
-                    response_date=checkin_date,
-                    value=value
-                )
-                db.session.add(response)
+        if category_responses:
+            response_rows = {
+                int(cat_id): {
+                    'client_id': client.id,
+                    'category_id': int(cat_id),
+                    'response_date': checkin_date,
+                    'value': value
+                }
+                for cat_id, value in category_responses.items()
+            }
+            stmt = pg_insert(CategoryResponse).values(list(response_rows.values()))
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['client_id', 'category_id', 'response_date'],
+                set_={'value': stmt.excluded.value}
+            ))
 
-        # Save goal completions
+        # Save goal completions the same way
         goal_completions = data.get('goal_completions', {})
-        for goal_id, completed in goal_completions.items():
-            # Check if completion exists
-            existing_completion = GoalCompletion.query.filter_by(
-                goal_id=int(goal_id),
-                completion_date=checkin_date
-            ).first()
-
-            if existing_completion:
-                existing_completion.completed = completed
-            else:
-                completion = GoalCompletion(
-                    goal_id=int(goal_id),
-                    completion_date=checkin_date,
-                    completed=completed
-                )
-                db.session.add(completion)
+        if goal_completions:
+            completion_rows = {
+                int(goal_id): {
+                    'goal_id': int(goal_id),
+                    'completion_date': checkin_date,
+                    'completed': completed
+                }
+                for goal_id, completed in goal_completions.items()
+            }
+            stmt = pg_insert(GoalCompletion).values(list(completion_rows.values()))
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['goal_id', 'completion_date'],
+                set_={'completed': stmt.excluded.completed}
+            ))
 
         db.session.commit()
+        invalidate_client_views(client.id)
 
         return jsonify({
             'success': True,
@@ -1095,43 +1518,61 @@ def get_client_progress():
         end_date = date.today()
         start_date = end_date - timedelta(days=30)
 
-        # Get check-ins
-        checkins = client.checkins.filter(
-            DailyCheckin.checkin_date.between(start_date, end_date)
-        ).order_by(DailyCheckin.checkin_date).all()
+        cached = get_client_view(client.id, ('progress', end_date))
+        if cached is not None:
+            return conditional_response(fast_jsonify(cached))
+
+        # Get check-ins as plain column rows; only four values are read
+        checkins = db.session.execute(
+            select(
+                DailyCheckin.checkin_date, DailyCheckin.emotional_value,
+                DailyCheckin.medication_value, DailyCheckin.activity_value
+            ).where(
+                DailyCheckin.client_id == client.id,
+                DailyCheckin.checkin_date.between(start_date, end_date)
+            ).order_by(DailyCheckin.checkin_date)
+        )
 
         checkin_data = []
-        for checkin in checkins:
+        for checkin_date, emotional, medication, activity in checkins:
             checkin_data.append({
-                'date': checkin.checkin_date.isoformat(),
-                'emotional': checkin.emotional_value,
-                'medication': checkin.medication_value,
-                'activity': checkin.activity_value
+                'date': checkin_date,
+                'emotional': emotional,
+                'medication': medication,
+                'activity': activity
             })
 
-        # Get category responses
+        # Get category responses for all active plans in one query, then
+        # bucket them per category
         category_data = {}
-        for plan in client.tracking_plans.filter_by(is_active=True):
-            responses = CategoryResponse.query.filter(
+        plans = client.tracking_plans.filter_by(is_active=True).all()
+        categories = tracking_categories_by_id({plan.category_id for plan in plans})
+        responses_by_category = defaultdict(list)
+        if plans:
+            for category_id, response_date, value in db.session.query(
+                    CategoryResponse.category_id, CategoryResponse.response_date, CategoryResponse.value
+            ).filter(
                 CategoryResponse.client_id == client.id,
-                CategoryResponse.category_id == plan.category_id,
+                CategoryResponse.category_id.in_([plan.category_id for plan in plans]),
                 CategoryResponse.response_date.between(start_date, end_date)
-            ).order_by(CategoryResponse.response_date).all()
+            ).order_by(CategoryResponse.response_date):
+                responses_by_category[category_id].append({
+                    'date': response_date,
+                    'value': value
+                })
 
-            category_data[plan.category.name] = [
-                {
-                    'date': resp.response_date.isoformat(),
-                    'value': resp.value
-                } for resp in responses
-            ]
+        for plan in plans:
+            category_data[categories[plan.category_id][0]] = responses_by_category[plan.category_id]
 
-        return jsonify({
+        payload = {
             'success': True,
             'progress': {
                 'checkins': checkin_data,
                 'categories': category_data
             }
-        })
+        }
+        store_client_view(client.id, ('progress', end_date), payload)
+        return conditional_response(fast_jsonify(payload))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1147,17 +1588,7 @@ def client_generate_report(week):
         client = request.current_user.client
 
         # Parse week
-        year, week_num = week.split('-W')
-        year = int(year)
-        week_num = int(week_num)
-
-        # Calculate week dates
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
+        year, week_num, week_start = parse_week(week)
         week_end = week_start + timedelta(days=6)
 
         # Create Excel workbook
@@ -1205,10 +1636,12 @@ def client_generate_report(week):
             cell.alignment = header_alignment
             cell.border = cell_border
 
-        # Get check-ins for the week
-        checkins = client.checkins.filter(
-            DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
-        ).order_by(DailyCheckin.checkin_date).all()
+        # Get check-ins for the week, keyed by date
+        checkins = {
+            c.checkin_date: c for c in client.checkins.filter(
+                DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
+            )
+        }
 
         # Populate data
         row = 8
@@ -1216,7 +1649,7 @@ def client_generate_report(week):
 
         for i in range(7):
             current_date = week_start + timedelta(days=i)
-            checkin = next((c for c in checkins if c.checkin_date == current_date.date()), None)
+            checkin = checkins.get(current_date.date())
 
             ws.cell(row=row, column=1).value = current_date.strftime('%Y-%m-%d')
             ws.cell(row=row, column=2).value = days[i]
@@ -1281,19 +1714,19 @@ def client_generate_report(week):
 
         if total_checkins > 0:
             # Average emotional rating
-            avg_emotional = sum(c.emotional_value for c in checkins if c.emotional_value) / total_checkins
+            avg_emotional = sum(c.emotional_value for c in checkins.values() if c.emotional_value) / total_checkins
             row += 1
             ws.cell(row=row, column=1).value = "Average Emotional Rating:"
             ws.cell(row=row, column=2).value = f"{avg_emotional:.1f}/5"
 
             # Medication adherence
-            med_adherent = sum(1 for c in checkins if c.medication_value == 5)
+            med_adherent = sum(1 for c in checkins.values() if c.medication_value == 5)
             row += 1
             ws.cell(row=row, column=1).value = "Medication Adherence:"
             ws.cell(row=row, column=2).value = f"{med_adherent}/{total_checkins} days"
 
             # Average activity
-            avg_activity = sum(c.activity_value for c in checkins if c.activity_value) / total_checkins
+            avg_activity = sum(c.activity_value for c in checkins.values() if c.activity_value) / total_checkins
             row += 1
             ws.cell(row=row, column=1).value = "Average Activity Level:"
             ws.cell(row=row, column=2).value = f"{avg_activity:.1f}/5"
@@ -1305,15 +1738,13 @@ def client_generate_report(week):
             ws.cell(row=row, column=1).value = "WEEKLY GOALS"
             ws.cell(row=row, column=1).font = Font(bold=True, size=12)
 
+            completed_days_by_goal = count_completed_days(weekly_goals, week_start, week_end)
             for goal in weekly_goals:
                 row += 1
                 ws.cell(row=row, column=1).value = f"• {goal.goal_text}"
 
                 # Goal completions
-                completions = goal.completions.filter(
-                    GoalCompletion.completion_date.between(week_start.date(), week_end.date())
-                ).all()
-                completed_days = sum(1 for c in completions if c.completed)
+                completed_days = completed_days_by_goal.get(goal.id, 0)
                 ws.cell(row=row, column=3).value = f"Completed: {completed_days}/7 days"
 
         # Adjust column widths
@@ -1329,9 +1760,10 @@ def client_generate_report(week):
             adjusted_width = min(max_length + 2, 50)
             ws.column_dimensions[column_letter].width = adjusted_width
 
-        # Save to BytesIO
+        # Save to BytesIO; serializing the workbook is the slow part, so it
+        # runs off the worker's event loop
         output = BytesIO()
-        wb.save(output)
+        run_blocking(wb.save, output)
         output.seek(0)
 
         # Generate filename
@@ -1361,17 +1793,7 @@ def client_email_report():
             return jsonify({'error': 'Week is required'}), 400
 
         # Parse week
-        year, week_num = week.split('-W')
-        year = int(year)
-        week_num = int(week_num)
-
-        # Calculate week dates
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
+        year, week_num, week_start = parse_week(week)
         week_end = week_start + timedelta(days=6)
 
         # Get therapist info
@@ -1379,10 +1801,12 @@ def client_email_report():
         therapist_email = therapist.user.email if therapist and therapist.user else "therapist@example.com"
         therapist_name = therapist.name if therapist else "Therapist"
 
-        # Get check-ins for the week
-        checkins = client.checkins.filter(
-            DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
-        ).order_by(DailyCheckin.checkin_date).all()
+        # Get check-ins for the week, keyed by date
+        checkins = {
+            c.checkin_date: c for c in client.checkins.filter(
+                DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
+            )
+        }
 
         # Build email content
         subject = f"Weekly Therapy Report - {client.client_serial} - Week {week_num}, {year}"
@@ -1402,7 +1826,7 @@ DAILY CHECK-IN SUMMARY:
 
         for i in range(7):
             current_date = week_start + timedelta(days=i)
-            checkin = next((c for c in checkins if c.checkin_date == current_date.date()), None)
+            checkin = checkins.get(current_date.date())
 
             content += f"\n{days[i]} ({current_date.strftime('%m/%d')}):\n"
 
@@ -1438,9 +1862,9 @@ DAILY CHECK-IN SUMMARY:
             content += "\nWEEKLY SUMMARY:\n"
 
             total_checkins = len(checkins)
-            avg_emotional = sum(c.emotional_value for c in checkins if c.emotional_value) / total_checkins
-            med_adherent = sum(1 for c in checkins if c.medication_value == 5)
-            avg_activity = sum(c.activity_value for c in checkins if c.activity_value) / total_checkins
+            avg_emotional = sum(c.emotional_value for c in checkins.values() if c.emotional_value) / total_checkins
+            med_adherent = sum(1 for c in checkins.values() if c.medication_value == 5)
+            avg_activity = sum(c.activity_value for c in checkins.values() if c.activity_value) / total_checkins
 
             content += f"- Completion Rate: {total_checkins}/7 days ({(total_checkins / 7) * 100:.0f}%)\n"
             content += f"- Average Emotional Rating: {avg_emotional:.1f}/5\n"
@@ -1451,11 +1875,9 @@ DAILY CHECK-IN SUMMARY:
         weekly_goals = client.goals.filter_by(week_start=week_start.date()).all()
         if weekly_goals:
             content += "\nWEEKLY GOALS:\n"
+            completed_days_by_goal = count_completed_days(weekly_goals, week_start, week_end)
             for goal in weekly_goals:
-                completions = goal.completions.filter(
-                    GoalCompletion.completion_date.between(week_start.date(), week_end.date())
-                ).all()
-                completed_days = sum(1 for c in completions if c.completed)
+                completed_days = completed_days_by_goal.get(goal.id, 0)
                 content += f"- {goal.goal_text}: Completed {completed_days}/7 days\n"
 
         content += f"\nReport generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
@@ -1482,17 +1904,7 @@ def get_client_week_checkins(week):
         client = request.current_user.client
 
         # Parse week
-        year, week_num = week.split('-W')
-        year = int(year)
-        week_num = int(week_num)
-
-        # Calculate week dates
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
+        year, week_num, week_start = parse_week(week)
         week_end = week_start + timedelta(days=6)
 
         # Get check-ins
@@ -1532,17 +1944,7 @@ def get_client_week_goals(week):
         client = request.current_user.client
 
         # Parse week
-        year, week_num = week.split('-W')
-        year = int(year)
-        week_num = int(week_num)
-
-        # Calculate week start
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
+        year, week_num, week_start = parse_week(week)
 
         # Get goals for the week
         goals = client.goals.filter_by(
@@ -1550,15 +1952,15 @@ def get_client_week_goals(week):
             is_active=True
         ).all()
 
+        week_days = [week_start.date() + timedelta(days=i) for i in range(7)]
+        completed_by_goal = week_completions_by_goal(goals, week_days)
+
         # Format response
         goals_data = []
         for goal in goals:
             # Get completions for the week
-            completions = {}
-            for i in range(7):
-                day = week_start.date() + timedelta(days=i)
-                completion = goal.completions.filter_by(completion_date=day).first()
-                completions[day.isoformat()] = completion.completed if completion else None
+            goal_completions = completed_by_goal[goal.id]
+            completions = {day.isoformat(): goal_completions.get(day) for day in week_days}
 
             goals_data.append({
                 'id': goal.id,
@@ -1641,10 +2043,12 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
         cell.alignment = header_alignment
         cell.border = cell_border
 
-    # Get check-ins for the week
-    checkins = client.checkins.filter(
-        DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
-    ).order_by(DailyCheckin.checkin_date).all()
+    # Get check-ins for the week, keyed by date
+    checkins = {
+        c.checkin_date: c for c in client.checkins.filter(
+            DailyCheckin.checkin_date.between(week_start.date(), week_end.date())
+        )
+    }
 
     # Color fills for ratings
     excellent_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")  # Green
@@ -1663,7 +2067,7 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
 
     for i in range(7):
         current_date = week_start + timedelta(days=i)
-        checkin = next((c for c in checkins if c.checkin_date == current_date.date()), None)
+        checkin = checkins.get(current_date.date())
 
         ws_checkins.cell(row=row, column=1).value = current_date.strftime('%Y-%m-%d')
         ws_checkins.cell(row=row, column=2).value = days[i]
@@ -1866,19 +2270,24 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
         is_active=True
     ).all()
 
+    # Get the week's completions for all goals at once
+    goal_completions = {}
+    if weekly_goals:
+        goal_completions = {
+            (c.goal_id, c.completion_date): c for c in GoalCompletion.query.filter(
+                GoalCompletion.goal_id.in_([goal.id for goal in weekly_goals]),
+                GoalCompletion.completion_date.between(week_start.date(), week_end.date())
+            )
+        }
+
     row = 4
     for goal in weekly_goals:
         ws_goals.cell(row=row, column=1).value = goal.goal_text
 
-        # Get completions for each day
-        completions = goal.completions.filter(
-            GoalCompletion.completion_date.between(week_start.date(), week_end.date())
-        ).all()
-
         completed_days = 0
         for day_idx in range(7):
             current_date = week_start.date() + timedelta(days=day_idx)
-            completion = next((c for c in completions if c.completion_date == current_date), None)
+            completion = goal_completions.get((goal.id, current_date))
 
             cell = ws_goals.cell(row=row, column=day_idx + 2)
             if completion:
@@ -1974,10 +2383,13 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
         row += 1
 
     # 5. Additional Tracking Categories Sheet (if any)
+    plans = client.tracking_plans.filter_by(is_active=True).all()
+    categories = tracking_categories_by_id({plan.category_id for plan in plans})
     additional_categories = []
-    for plan in client.tracking_plans.filter_by(is_active=True):
-        if plan.category.name not in ['Emotion Level', 'Medication', 'Physical Activity']:
-            additional_categories.append(plan.category)
+    for plan in plans:
+        name = categories[plan.category_id][0]
+        if name not in ['Emotion Level', 'Medication', 'Physical Activity']:
+            additional_categories.append((plan.category_id, name))
 
     if additional_categories:
         ws_tracking = wb.create_sheet("Additional Tracking")
@@ -1990,7 +2402,7 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
         tracking_title.alignment = header_alignment
 
         # Headers
-        tracking_headers = ['Date', 'Day'] + [cat.name for cat in additional_categories]
+        tracking_headers = ['Date', 'Day'] + [name for _, name in additional_categories]
         for col, header in enumerate(tracking_headers, 1):
             cell = ws_tracking.cell(row=3, column=col)
             cell.value = header
@@ -1999,6 +2411,15 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
             cell.alignment = header_alignment
             cell.border = cell_border
 
+        # Get the week's responses for these categories, keyed by category and date
+        responses = {
+            (r.category_id, r.response_date): r for r in CategoryResponse.query.filter(
+                CategoryResponse.client_id == client.id,
+                CategoryResponse.category_id.in_([category_id for category_id, _ in additional_categories]),
+                CategoryResponse.response_date.between(week_start.date(), week_end.date())
+            )
+        }
+
         # Data
         row = 4
         for i in range(7):
@@ -2006,13 +2427,9 @@ def create_weekly_report_excel(client, therapist, week_start, week_end, week_num
             ws_tracking.cell(row=row, column=1).value = current_date.strftime('%Y-%m-%d')
             ws_tracking.cell(row=row, column=2).value = days[i]
 
-            # Get responses for each category
-            for col_idx, category in enumerate(additional_categories, 3):
-                response = CategoryResponse.query.filter_by(
-                    client_id=client.id,
-                    category_id=category.id,
-                    response_date=current_date.date()
-                ).first()
+            # Fill in each category's response
+            for col_idx, (category_id, _) in enumerate(additional_categories, 3):
+                response = responses.get((category_id, current_date.date()))
 
                 cell = ws_tracking.cell(row=row, column=col_idx)
                 if response:
@@ -2079,25 +2496,16 @@ def generate_report(client_id, week):
             return jsonify({'error': 'Client not found'}), 404
 
         # Parse week
-        year, week_num = week.split('-W')
-        year = int(year)
-        week_num = int(week_num)
-
-        # Calculate week dates
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
+        year, week_num, week_start = parse_week(week)
         week_end = week_start + timedelta(days=6)
 
         # Create Excel workbook using the shared function
         wb = create_weekly_report_excel(client, therapist, week_start, week_end, week_num, year)
 
-        # Save to BytesIO
+        # Save to BytesIO; serializing the workbook is the slow part, so it
+        # runs off the worker's event loop
         output = BytesIO()
-        wb.save(output)
+        run_blocking(wb.save, output)
         output.seek(0)
 
         # Generate filename
@@ -2150,19 +2558,9 @@ def email_therapy_report():
 
         # Parse week
         try:
-            year, week_num = week.split('-W')
-            year = int(year)
-            week_num = int(week_num)
+            year, week_num, week_start = parse_week(week)
         except (ValueError, AttributeError):
             return jsonify({'error': 'Invalid week format'}), 400
-
-        # Calculate week dates
-        jan1 = datetime(year, 1, 1)
-        days_to_monday = (7 - jan1.weekday()) % 7
-        if days_to_monday == 0:
-            days_to_monday = 7
-        first_monday = jan1 + timedelta(days=days_to_monday - 7)
-        week_start = first_monday + timedelta(weeks=week_num - 1)
         week_end = week_start + timedelta(days=6)
 
         # Get check-ins for summary
@@ -2235,7 +2633,7 @@ Best regards,
 
             # Save to BytesIO for email attachment
             excel_buffer = BytesIO()
-            wb.save(excel_buffer)
+            run_blocking(wb.save, excel_buffer)
             excel_buffer.seek(0)
 
             # Create email
@@ -2286,13 +2684,69 @@ Best regards,
 
 # ============= HEALTH CHECK =============
 
+# Health checks are polled constantly, so the body is encoded at most once
+# per second and reused; the timestamp keeps whole-second resolution
+_health_body = (None, b'')
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat()
-    })
+    global _health_body
+    second = int(time.time())
+    body_second, body = _health_body
+    if body_second != second:
+        body = orjson.dumps({
+            'status': 'healthy',
+            'timestamp': datetime.utcfromtimestamp(second).isoformat()
+        })
+        _health_body = (second, body)
+    return app.response_class(body, mimetype='application/json')
+
+
+# ============= DIAGNOSTICS =============
+
+# Slow query log: statements taking longer than SLOW_QUERY_MS are logged with
+# their duration; bound parameters are included only in debug mode since
+# they can carry client data
+SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 100))
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def mark_statement_start(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_start_time'] = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def log_slow_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['query_start_time']) * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        if app.debug:
+            app.logger.warning("Slow query (%.0f ms): %s %r", elapsed_ms, ' '.join(statement.split()), parameters)
+        else:
+            app.logger.warning("Slow query (%.0f ms): %s", elapsed_ms, ' '.join(statement.split()))
+
+
+# N+1 detector: with LOG_N_PLUS_ONE=1 (never in production) any statement a
+# single request runs N_PLUS_ONE_THRESHOLD or more times is logged, which is
+# the signature of a lazy load or per-row query inside a loop
+N_PLUS_ONE_THRESHOLD = 3
+
+if os.environ.get('LOG_N_PLUS_ONE') and not os.environ.get('PRODUCTION'):
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_request_statements(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.setdefault('statement_counts', Counter())[statement] += 1
+
+    @app.after_request
+    def log_repeated_statements(response):
+        for statement, count in g.get('statement_counts', {}).items():
+            if count >= N_PLUS_ONE_THRESHOLD:
+                app.logger.warning(
+                    "Possible N+1 query in %s %s: %dx %s",
+                    request.method, request.path, count, ' '.join(statement.split())[:200]
+                )
+        return response
 
 
 # ============= INITIALIZATION =============
@@ -2323,29 +2777,42 @@ def initialize_database():
                 ('Motivation', 'Level of motivation and drive', False)
             ]
 
-            for name, description, is_default in default_categories:
-                category = TrackingCategory(
-                    name=name,
-                    description=description,
-                    is_default=is_default
-                )
-                db.session.add(category)
+            db.session.execute(insert(TrackingCategory), [
+                {'name': name, 'description': description, 'is_default': is_default}
+                for name, description, is_default in default_categories
+            ])
 
             db.session.commit()
+            with _category_cache_lock:
+                _category_cache.clear()
             print("Database initialized with default tracking categories")
     except Exception as e:
         print(f"Database initialization error: {e}")
         _initialized = False
 
 
-# Initialize on first request (replaces @app.before_first_request)
-@app.before_request
-def before_request():
-    initialize_database()
+def check_unique_indexes():
+    """Raise if a model's unique index is missing from the database
 
-
-# Don't initialize on import for production
-# Let init_db.py handle it during deployment
+    The ON CONFLICT upserts (e.g. category responses in submit_checkin) need
+    these indexes, and on an existing database only init_db.py builds them.
+    Checked when a worker boots so a skipped init_db fails the deploy instead
+    of every check-in.
+    """
+    missing = []
+    with app.app_context():
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            unique_names = {index.name for index in table.indexes if index.unique}
+            if unique_names:
+                existing = {index['name'] for index in inspector.get_indexes(table.name)}
+                missing.extend(sorted(unique_names - existing))
+    if missing:
+        raise RuntimeError(f"Missing unique indexes {', '.join(missing)}; run init_db.py before starting the app")
+
+
+# Initialize once per process rather than on every request. In production
+# init_db.py does this during deployment, before gunicorn starts
 if not os.environ.get('PRODUCTION'):
     with app.app_context():
         initialize_database()
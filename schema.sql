@@ -146,9 +146,15 @@ CREATE TABLE session_tokens (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_clients_therapist ON clients(therapist_id);
-CREATE INDEX idx_checkins_client_date ON daily_checkins(client_id, checkin_date);
+CREATE INDEX idx_clients_therapist_active ON clients(therapist_id, is_active);
+CREATE INDEX idx_checkins_client_date_covering ON daily_checkins(client_id, checkin_date DESC)
+    INCLUDE (emotional_value, medication_value, activity_value);
+CREATE INDEX idx_tracking_plans_client_active ON client_tracking_plans(client_id, is_active);
 CREATE INDEX idx_category_responses_client ON category_responses(client_id, response_date);
+CREATE UNIQUE INDEX uq_category_responses_client_category_date ON category_responses(client_id, category_id, response_date);
+CREATE INDEX idx_weekly_goals_client_week ON weekly_goals(client_id, week_start, is_active);
+CREATE INDEX idx_therapist_notes_missions ON therapist_notes(therapist_id, is_mission, mission_completed);
+CREATE INDEX idx_therapist_notes_client ON therapist_notes(client_id, therapist_id, created_at DESC);
 CREATE INDEX idx_reports_client ON reports(client_id, week_start);
 CREATE INDEX idx_session_tokens_user ON session_tokens(user_id);
 CREATE INDEX idx_session_tokens_token ON session_tokens(token);
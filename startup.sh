@@ -26,4 +26,4 @@ python init_db.py
 # Start the application
 echo ""
 echo "Starting Gunicorn..."
-exec gunicorn new_backend:app --bind 0.0.0.0:${PORT:-10000} --workers 1 --threads 2 --timeout 120 --log-level info
+exec gunicorn new_backend:app -c gunicorn.conf.py